@@ -176,9 +176,9 @@ def get_course_by_code(code: str) -> Optional[Course]:
     """
     all_lists = get_academic_lists()
     for academic_list in all_lists:
-        for course in academic_list.courses:
-            if course.code == code:
-                return course
+        course = academic_list.get(code)
+        if course is not None:
+            return course
     return None
 
 
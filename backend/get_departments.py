@@ -3,24 +3,27 @@
 
 import logging
 import os
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-import requests
 from dotenv import load_dotenv
 
-from backend.login import get_auth_token, login
+try:
+    import orjson
+except ImportError:  # optional: faster JSON parsing
+    orjson = None
+
+from backend.login import get_auth_token, get_session, login
 from models.department import Department
 from utils.api_departments import convert_api_department
 
-# Set up logging
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Set up logging (configuration is left to the application)
+logger = logging.getLogger("backend.get_departments")
 
 
 def get_departments() -> List[Dict]:
     """
-    Fetch departments from the backend API.
+    Get departments from the backend API, fetching them once per cache clear.
 
     Returns:
         List of dictionaries with department information including:
@@ -29,18 +32,23 @@ def get_departments() -> List[Dict]:
         - name_en: The English name
         - name_ar: The Arabic name
     """
+    return list(_fetch_departments())
+
+
+@lru_cache(maxsize=1)
+def _fetch_departments() -> Tuple[Dict, ...]:
+    """Fetch departments from the backend API (cached, see clear_department_cache)"""
     load_dotenv()
     token = get_auth_token()
 
     url = os.getenv("BACKEND_URL")
-    headers = {
-        "Accept": "application/json",
-        "Accept-Language": "en",
-        "Authorization": f"Bearer {token}",
-    }
+    headers = {"Authorization": f"Bearer {token}"}
 
-    response = requests.get(f"{url}/departments", headers=headers)
-    data = response.json()
+    # Reuse the pooled session so repeated lookups skip the TCP/TLS handshake
+    response = get_session().get(f"{url}/departments", headers=headers)
+    # Raise rather than return so a failed fetch is never cached
+    response.raise_for_status()
+    data = orjson.loads(response.content) if orjson else response.json()
 
     # Check if response has the expected structure
     if "data" in data:
@@ -49,10 +57,14 @@ def get_departments() -> List[Dict]:
         # Handle the case where the response structure is different
         departments_data = data if isinstance(data, list) else []
 
+    if not departments_data:
+        raise ValueError("Departments API returned no departments")
+
     # Log the raw data for debugging
-    logging.debug(f"Raw API response contained {len(departments_data)} departments")
+    logger.debug("Raw API response contained %d departments", len(departments_data))
 
     # Process departments with detailed information
+    log_debug = logger.isEnabledFor(logging.DEBUG)
     departments = []
     for dept_data in departments_data:
         # Convert to standard format
@@ -65,9 +77,17 @@ def get_departments() -> List[Dict]:
         departments.append(department_info)
 
         # Log for verification
-        logging.debug(f"Processed department: {department_info['name_en']}")
+        if log_debug:
+            logger.debug("Processed department: %s", department_info["name_en"])
+
+    return tuple(departments)
 
-    return departments
+
+def clear_department_cache():
+    """Drop cached department data so the next lookup refetches from the API"""
+    _fetch_departments.cache_clear()
+    _department_map.cache_clear()
+    _department_name_index.cache_clear()
 
 
 def get_department_by_id(department_id: int) -> Optional[Dict]:
@@ -80,11 +100,7 @@ def get_department_by_id(department_id: int) -> Optional[Dict]:
     Returns:
         Dictionary with department information or None if not found
     """
-    departments = get_departments()
-    for dept in departments:
-        if dept["id"] == department_id:
-            return dept
-    return None
+    return _department_map().get(department_id)
 
 
 def get_department_by_name(name: str, language: str = "en") -> Optional[Dict]:
@@ -98,17 +114,20 @@ def get_department_by_name(name: str, language: str = "en") -> Optional[Dict]:
     Returns:
         Dictionary with department information or None if not found
     """
-    departments = get_departments()
+    # Case-insensitive search
+    return _department_name_index(language).get(name.lower())
+
 
-    # Determine which field to search based on language
+@lru_cache(maxsize=2)
+def _department_name_index(language: str) -> Dict[str, Dict]:
+    # Determine which field to index based on language
     field_name = "name_en" if language == "en" else "name_ar"
 
-    # Case-insensitive search
-    name_lower = name.lower()
-    for dept in departments:
-        if dept[field_name].lower() == name_lower:
-            return dept
-    return None
+    # Keep the first department for a name, matching a front-to-back scan
+    index = {}
+    for dept in _fetch_departments():
+        index.setdefault(dept[field_name].lower(), dept)
+    return index
 
 
 def get_department_map() -> Dict[int, Department]:
@@ -118,11 +137,20 @@ def get_department_map() -> Dict[int, Department]:
     Returns:
         Dictionary mapping department IDs to Department enum values
     """
-    departments = get_departments()
-    return {dept["id"]: dept for dept in departments}
+    return dict(_department_map())
+
+
+@lru_cache(maxsize=1)
+def _department_map() -> Dict[int, Dict]:
+    return {dept["id"]: dept for dept in _fetch_departments()}
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
     # Test the main function
     departments = get_departments()
     print(f"Retrieved {len(departments)} departments")
@@ -62,11 +62,13 @@ def get_labs(lab_type: Optional[str] = None) -> List[Lab]:
     # Local filtering if API doesn't support it
     filtered_labs = labs
     if lab_type:
-        if lab_type.lower() == "specialist":
+        # Normalize once rather than once per comparison
+        wanted_type = lab_type.lower()
+        if wanted_type == "specialist":
             logging.debug("Filtering for SPECIALIST labs")
             filtered_labs = [lab for lab in labs if lab.lab_type == LabType.SPECIALIST]
             logging.debug(f"Found {len(filtered_labs)} SPECIALIST labs after filtering")
-        elif lab_type.lower() == "general":
+        elif wanted_type == "general":
             logging.debug("Filtering for GENERAL labs")
             filtered_labs = [lab for lab in labs if lab.lab_type == LabType.GENERAL]
             logging.debug(f"Found {len(filtered_labs)} GENERAL labs after filtering")
@@ -3,6 +3,7 @@
 
 import logging
 import os
+from functools import lru_cache
 from typing import Dict, List, Optional, Union
 
 import requests
@@ -10,10 +11,15 @@ from dotenv import load_dotenv
 
 from backend.login import get_auth_token, login
 from models.department import Department
-from models.staff_members import Lecturer, StaffMember, TeachingAssistant
+from models.staff_members import (
+    Lecturer,
+    StaffMember,
+    StaffRegistry,
+    TeachingAssistant,
+)
 from utils.api_staff import (
     convert_api_lecturer,
-    convert_api_staff_member,
+    convert_api_staff_members,
     convert_api_teaching_assistant,
 )
 
@@ -54,22 +60,12 @@ def get_all_staff_members() -> List[StaffMember]:
     logging.debug(f"Raw API response contained {len(staff_data)} staff members")
 
     # Convert API data to staff member objects
-    staff_members = []
-    for member_data in staff_data:
-        try:
-            staff_member = convert_api_staff_member(member_data)
-            staff_members.append(staff_member)
-            logging.debug(
-                f"Converted {type(staff_member).__name__}: {staff_member.name}"
-            )
-        except Exception as e:
-            logging.error(
-                f"Error converting staff member {member_data.get('name', 'unknown')}: {str(e)}"
-            )
+    staff_members = convert_api_staff_members(staff_data)
 
-    # Log statistics
-    lecturers_count = sum(1 for m in staff_members if isinstance(m, Lecturer))
-    tas_count = sum(1 for m in staff_members if isinstance(m, TeachingAssistant))
+    # Log statistics; every converted member is a lecturer or a TA, so one
+    # pass counting lecturers gives both totals
+    lecturers_count = sum(isinstance(m, Lecturer) for m in staff_members)
+    tas_count = len(staff_members) - lecturers_count
     logging.debug(
         f"Converted {lecturers_count} lecturers and {tas_count} teaching assistants"
     )
@@ -201,11 +197,7 @@ def get_staff_member_by_id(staff_id: int) -> Optional[StaffMember]:
     Returns:
         StaffMember object or None if not found
     """
-    all_staff = get_all_staff_members()
-    for member in all_staff:
-        if member.id == staff_id:
-            return member
-    return None
+    return _staff_registry().get(staff_id)
 
 
 def get_staff_by_department(department: Department) -> List[StaffMember]:
@@ -218,8 +210,19 @@ def get_staff_by_department(department: Department) -> List[StaffMember]:
     Returns:
         List of StaffMember objects in the specified department
     """
-    all_staff = get_all_staff_members()
-    return [member for member in all_staff if member.department == department]
+    return _staff_registry().in_department(department)
+
+
+@lru_cache(maxsize=1)
+def _staff_registry() -> StaffRegistry:
+    # Study plan conversion looks up every lecturer and TA by id; fetch the
+    # staff list once instead of once per lookup (see clear_staff_cache)
+    return StaffRegistry(get_all_staff_members())
+
+
+def clear_staff_cache():
+    """Drop the cached staff registry so the next lookup refetches from the API"""
+    _staff_registry.cache_clear()
 
 
 if __name__ == "__main__":
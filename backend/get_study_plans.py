@@ -342,7 +342,7 @@ def validate_study_plan(study_plan: StudyPlan) -> bool:
             valid = False
 
         # Lecturer assignments validation
-        total_lecturer_groups = sum(la["num_of_groups"] for la in course.lecturers)
+        total_lecturer_groups = sum(course.lecturer_group_counts)
         if total_lecturer_groups != course.lecture_groups:
             logger.warning(
                 f"Course {course.course_code} has mismatched lecturer assignments: {total_lecturer_groups} vs {course.lecture_groups}"
@@ -361,9 +361,7 @@ def validate_study_plan(study_plan: StudyPlan) -> bool:
                 logger.info(
                     f"    Course has {len(course.teaching_assistants)} TA assignments"
                 )
-                total_ta_groups = sum(
-                    ta["num_of_groups"] for ta in course.teaching_assistants
-                )
+                total_ta_groups = sum(course.ta_group_counts)
                 if total_ta_groups != course.lab_groups:
                     logger.warning(
                         f"Course {course.course_code} has mismatched TA assignments: {total_ta_groups} vs {course.lab_groups}"
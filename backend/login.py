@@ -5,6 +5,22 @@ import os
 import requests
 from dotenv import load_dotenv
 
+_SESSION = None
+
+
+def get_session():
+    """Get the shared HTTP session, created only once"""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        _SESSION.headers.update(
+            {
+                "Accept": "application/json",
+                "Accept-Language": "en",
+            }
+        )
+    return _SESSION
+
 
 def login():
     load_dotenv()
@@ -14,13 +30,9 @@ def login():
 
     print(f"Logging in to {url} with email {email}")
 
-    response = requests.post(
+    response = get_session().post(
         f"{url}/login",
         json={"email": email, "password": password},
-        headers={
-            "Accept": "application/json",
-            "Accept-Language": "en",
-        },
     )
 
     data = response.json()
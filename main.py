@@ -5,6 +5,7 @@ import logging
 import os
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
 
@@ -12,15 +13,18 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from backend.get_departments import clear_department_cache
 from backend.get_halls import get_halls
 from backend.get_labs import get_labs
+from backend.get_staff_members import clear_staff_cache
 from backend.get_study_plans import get_study_plans_by_ids
+from backend.login import get_auth_token
 from backend.post_schedule import post_schedule_with_retry, validate_schedule_data
 from managers.constraint_manager import ConstraintManager
 from managers.resource_manager import ResourceManager
 from schedule_format import (
+    generate_schedule_files,
     generate_schedule_json,
-    generate_schedule_report,
     print_schedule_statistics,
 )
 from schedule_validator import ScheduleValidator
@@ -232,6 +236,11 @@ class ScheduleGenerationEngine:
             self.logger.info("=== STARTING SCHEDULE GENERATION ENGINE ===")
             self.progress.update_progress(0, "Starting schedule generation engine")
 
+            # Department and staff lookups are cached per process; refetch them
+            # for every run so backend edits since the last run are picked up
+            clear_department_cache()
+            clear_staff_cache()
+
             # Step 1: Fetch study plans
             if not self._fetch_study_plans():
                 return False
@@ -358,14 +367,17 @@ class ScheduleGenerationEngine:
             self.logger.info("=== FETCHING FACILITIES ===")
             self.progress.update_progress(2, "Fetching halls and laboratories")
 
-            # Fetch halls
-            self.logger.info("Fetching halls...")
-            self.halls = get_halls()
-            self.logger.info(f"Received {len(self.halls)} halls")
+            # Log in up front so both fetches reuse the same token
+            get_auth_token()
 
-            # Fetch labs
-            self.logger.info("Fetching labs...")
-            self.labs = get_labs()
+            # Fetch halls and labs concurrently; each is a single network round-trip
+            self.logger.info("Fetching halls and labs...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                halls_future = executor.submit(get_halls)
+                labs_future = executor.submit(get_labs)
+                self.halls = halls_future.result()
+                self.labs = labs_future.result()
+            self.logger.info(f"Received {len(self.halls)} halls")
             self.logger.info(f"Received {len(self.labs)} labs")
 
             if not self.halls and not self.labs:
@@ -632,14 +644,11 @@ class ScheduleGenerationEngine:
             # Generate timestamp for file names
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Generate JSON file using existing function
+            # Generate the JSON file and text report in one pass
             json_filename = f"schedule_{timestamp}.json"
-            generate_schedule_json(self.assignments, json_filename)
-            self.output_files.append(json_filename)
-
-            # Generate text report using existing function
             txt_filename = f"schedule_report_{timestamp}.txt"
-            generate_schedule_report(self.assignments, txt_filename)
+            generate_schedule_files(self.assignments, json_filename, txt_filename)
+            self.output_files.append(json_filename)
             self.output_files.append(txt_filename)
 
             # Print statistics to console using existing function
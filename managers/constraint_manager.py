@@ -2,47 +2,74 @@
 
 
 import logging
-from copy import deepcopy
+from bisect import insort
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import time
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from models.block import Assignment, Block
 from models.halls import Hall
 from models.labs import Lab
-from models.staff_members import Lecturer, TeachingAssistant
+from models.room import Room
+from models.staff_members import StaffKind
 from models.time_preferences import Day, TimePreference
 from utils.room_utils import get_room_key
 
+# Hard constraint descriptions
+NO_DOUBLE_ROOM_BOOKING = "No double room booking"
+NO_DOUBLE_STAFF_BOOKING = "No double staff booking"
+ROOM_AVAILABILITY = "Room must be available in the given time slot"
+SINGLE_GROUP_CONFLICT = "Single group courses cannot have parallel sessions"
+LAB_REQUIREMENTS = "Lab specialization and preferences must be met"
 
-@dataclass
+# Soft constraint weights
+LECTURER_PREFERENCE_WEIGHT = 5.0
+TA_PREFERENCE_WEIGHT = 3.0
+GAPS_WEIGHT = 2.0
+ROOM_CAPACITY_WEIGHT = 1.5
+
+
+@dataclass(slots=True)
 class SchedulerState:
     """Maintains the current state of assignments for efficient constraint checking"""
 
     room_bookings: Dict[
-        str, Dict[Tuple[Day, time], str]
-    ]  # room_id -> {(day, time) -> block_id}
-    staff_bookings: Dict[
-        int, Dict[Tuple[Day, time], str]
-    ]  # staff_id -> {(day, time) -> block_id}
-    course_slots: Dict[
-        str, Dict[Tuple[Day, time], int]
-    ]  # course_code -> {(day, time) -> count}
+        Tuple[str, int], Dict[int, str]
+    ]  # (room_type, room_id) -> {slot_id -> block_id}
+    staff_bookings: Dict[int, Dict[int, str]]  # staff_id -> {slot_id -> block_id}
+    course_slots: Dict[str, Dict[int, int]]  # course_code -> {slot_id -> count}
     level_slots: Dict[
-        Tuple[str, int], Dict[Day, List[time]]
-    ]  # (academic_list, level) -> {day -> [times]}
+        Tuple[str, int, Day], List[time]
+    ]  # (academic_list, level, day) -> sorted [times]
     study_plan_slots: Dict[
-        Tuple[str, Day, time], List[str]
-    ]  # (academic_list, day, time) -> [block_ids]
+        Tuple[str, int], List[str]
+    ]  # (academic_list, slot_id) -> [block_ids]
+    single_group_slots: Dict[
+        Tuple[str, int], int
+    ]  # (academic_list, slot_id) -> count of single-group blocks
+    plan_course_slots: Dict[
+        Tuple[str, int, str], int
+    ]  # (academic_list, slot_id, course_code) -> count of blocks
+    plan_course_single_slots: Dict[
+        Tuple[str, int, str], int
+    ]  # (academic_list, slot_id, course_code) -> count of one-group blocks
+    room_busy: Dict[Tuple[str, int], int]  # (room_type, room_id) -> slot_mask union
+    staff_busy: Dict[int, int]  # staff_id -> slot_mask union
 
     @classmethod
     def create_empty(cls):
         return cls(
-            room_bookings={},
-            staff_bookings={},
-            course_slots={},
-            level_slots={},
-            study_plan_slots={},
+            room_bookings=defaultdict(dict),
+            staff_bookings=defaultdict(dict),
+            course_slots=defaultdict(Counter),
+            level_slots=defaultdict(list),
+            study_plan_slots=defaultdict(list),
+            single_group_slots=Counter(),
+            plan_course_slots=Counter(),
+            plan_course_single_slots=Counter(),
+            room_busy=defaultdict(int),
+            staff_busy=defaultdict(int),
         )
 
 
@@ -50,6 +77,9 @@ class ConstraintManager:
     def __init__(self):
         self.hard_constraints = []
         self.soft_constraints = []
+        self._soft_scorers = {}  # block_id -> (block, compiled scorer)
+        # Bumped on every state change so callers can cache derived views
+        self.state_version = 0
         self.logger = logging.getLogger("constraint_manager")
         self.initialize_fresh_state()
         self.setup_constraints()
@@ -58,12 +88,115 @@ class ConstraintManager:
         """Initialize completely empty state"""
         self.state = SchedulerState.create_empty()
         self.current_assignments = {}
+        self.state_version += 1
         self.logger.info("ConstraintManager state initialized fresh")
 
     def can_assign(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> Tuple[bool, Optional[str]]:
         """Check if assignment is possible WITHOUT modifying state"""
+        has_extra_constraints = (
+            len(self.hard_constraints) != self._builtin_hard_constraint_count
+        )
+        if has_extra_constraints or self.logger.isEnabledFor(logging.DEBUG):
+            # Extra constraints were registered or we want per-check logging
+            return self._check_hard_constraints(block, slot, room)
+
+        # Straight-line version of the built-in hard constraints, cheapest first
+        description = None
+        try:
+            description = LAB_REQUIREMENTS
+            if not self.check_lab_requirements(block, slot, room):
+                return False, description
+
+            slot_key = slot.slot_id
+
+            description = NO_DOUBLE_ROOM_BOOKING
+            if slot_key in self.state.room_bookings.get(get_room_key(room), ()):
+                return False, description
+
+            description = NO_DOUBLE_STAFF_BOOKING
+            if slot_key in self.state.staff_bookings.get(block.staff_member.id, ()):
+                return False, description
+
+            description = ROOM_AVAILABILITY
+            if not self.check_room_availability(block, slot, room):
+                return False, description
+
+            description = SINGLE_GROUP_CONFLICT
+            if not self.check_single_group_conflict(block, slot, room):
+                return False, description
+        except Exception as e:
+            self.logger.error(f"Error in constraint {description}: {str(e)}")
+            return False, f"Error in {description}: {str(e)}"
+
+        return True, None
+
+    def iter_can_assign(
+        self, block, slots: Iterable[TimePreference], room: Union[Hall, Lab]
+    ) -> Iterator[Tuple[TimePreference, bool, Optional[str]]]:
+        """
+        Lazily yield (slot, is_valid, violation) for each slot, like can_assign.
+
+        Checks that depend only on the block and room run once for the whole
+        batch; only the per-slot checks run inside the loop. Nothing is
+        mutated, so callers may stop at the first valid slot.
+        """
+        has_extra_constraints = (
+            len(self.hard_constraints) != self._builtin_hard_constraint_count
+        )
+        if has_extra_constraints or self.logger.isEnabledFor(logging.DEBUG):
+            for slot in slots:
+                is_valid, violation = self.can_assign(block, slot, room)
+                yield slot, is_valid, violation
+            return
+
+        # Shared prefix: the lab requirements never look at the slot
+        try:
+            room_usable = self.check_lab_requirements(block, None, room)
+        except Exception as e:
+            self.logger.error(f"Error in constraint {LAB_REQUIREMENTS}: {str(e)}")
+            room_usable = False
+            lab_violation = f"Error in {LAB_REQUIREMENTS}: {str(e)}"
+        else:
+            lab_violation = LAB_REQUIREMENTS
+        if not room_usable:
+            for slot in slots:
+                yield slot, False, lab_violation
+            return
+
+        room_slots = self.state.room_bookings.get(get_room_key(room), {})
+        staff_slots = self.state.staff_bookings.get(block.staff_member.id, {})
+        for slot in slots:
+            slot_key = slot.slot_id
+            if slot_key in room_slots:
+                yield slot, False, NO_DOUBLE_ROOM_BOOKING
+                continue
+            if slot_key in staff_slots:
+                yield slot, False, NO_DOUBLE_STAFF_BOOKING
+                continue
+
+            description = ROOM_AVAILABILITY
+            try:
+                if not self.check_room_availability(block, slot, room):
+                    yield slot, False, description
+                    continue
+
+                description = SINGLE_GROUP_CONFLICT
+                if not self.check_single_group_conflict(block, slot, room):
+                    yield slot, False, description
+                    continue
+            except Exception as e:
+                self.logger.error(f"Error in constraint {description}: {str(e)}")
+                yield slot, False, f"Error in {description}: {str(e)}"
+                continue
+
+            yield slot, True, None
+
+    def _check_hard_constraints(
+        self, block, slot: TimePreference, room: Union[Hall, Lab]
+    ) -> Tuple[bool, Optional[str]]:
+        """Run every registered hard constraint in order, with debug logging"""
         self.logger.debug(f"=== CHECKING IF CAN ASSIGN {block.id} ===")
         self.logger.debug(f"Current assignments: {len(self.current_assignments)}")
 
@@ -88,9 +221,6 @@ class ConstraintManager:
         """ATOMIC OPERATION: Check constraints and commit assignment in one step"""
         self.logger.debug(f"=== MAKING ASSIGNMENT {block_id} ===")
 
-        current_state_snapshot = deepcopy(self.state)
-        current_assignments_snapshot = self.current_assignments.copy()
-
         if block_id in self.current_assignments:
             self.logger.warning(
                 f"Block {block_id} is already assigned — skipping reassignment."
@@ -98,15 +228,25 @@ class ConstraintManager:
             return False
 
         try:
+            # _add_to_state validates before mutating, so a failure leaves
+            # the state untouched and no snapshot is needed
             self._add_to_state(block_id, assignment)
             return True
         except Exception as e:
-            # CRITICAL: Rollback to snapshot on ANY failure
-            self.state = current_state_snapshot
-            self.current_assignments = current_assignments_snapshot
             self.logger.error(f"Assignment failed: {str(e)}")
             return False
 
+    def undo_assignment(self, block_id: str) -> bool:
+        """Remove a committed assignment and release its bookings"""
+        self.logger.debug(f"=== UNDOING ASSIGNMENT {block_id} ===")
+
+        if block_id not in self.current_assignments:
+            self.logger.warning(f"Block {block_id} is not assigned — nothing to undo.")
+            return False
+
+        self._remove_from_state(block_id)
+        return True
+
     def _verify_no_conflicts_in_slot(self, slot: TimePreference):
         """Verify no conflicts exist in the given time slot"""
         slot_key = (slot.day, slot.start_time)
@@ -147,77 +287,179 @@ class ConstraintManager:
         """Get all current assignments"""
         return self.current_assignments.copy()
 
+    def get_room_assignments(self, room: Union[Hall, Lab]) -> Dict[str, Assignment]:
+        """Get the current assignments booked in room, via the room index"""
+        assignments = self.current_assignments
+        return {
+            block_id: assignments[block_id]
+            for block_id in self.state.room_bookings.get(
+                get_room_key(room), {}
+            ).values()
+        }
+
     def _add_to_state(self, block_id: str, assignment: Assignment):
         """Add assignment to internal state tracking"""
-        self._verify_no_conflicts_before_commit(assignment)
-
         block = assignment.block
-        slot_key = (assignment.time_slot.day, assignment.time_slot.start_time)
+        slot_key = assignment.time_slot.slot_id
         room_key = get_room_key(
             assignment.room
         )  # This returns (room_type, room_id) tuple
+        staff_id = block.staff_member.id
 
         if block_id in self.current_assignments:
             raise Exception(f"Block {block_id} already assigned — invalid state")
 
+        # Validate against the booking indices before touching any state
+        room_slots = self.state.room_bookings.get(room_key, {})
+        if slot_key in room_slots:
+            raise Exception(
+                f"Room conflict: {room_key} at {assignment.time_slot} already has {room_slots[slot_key]}"
+            )
+
+        staff_slots = self.state.staff_bookings.get(staff_id, {})
+        if slot_key in staff_slots:
+            raise Exception(
+                f"Staff conflict: {staff_id} at {assignment.time_slot} already has {staff_slots[slot_key]}"
+            )
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # Full scan of the assignments to catch drift in the indices
+            self._verify_no_conflicts_before_commit(assignment)
+
         self.logger.debug(f"Adding {block_id} to state:")
         self.logger.debug(f"  Room key: {room_key}")
-        self.logger.debug(f"  Slot key: {slot_key}")
-        self.logger.debug(f"  Staff ID: {block.staff_member.id}")
+        self.logger.debug(f"  Slot: {assignment.time_slot} (slot id {slot_key})")
+        self.logger.debug(f"  Staff ID: {staff_id}")
 
         # Store the assignment
         self.current_assignments[block_id] = assignment
+        self.state_version += 1
 
         # Update room bookings (using composite key)
-        if room_key not in self.state.room_bookings:
-            self.state.room_bookings[room_key] = {}
-
-        if slot_key in self.state.room_bookings[room_key]:
-            existing_block = self.state.room_bookings[room_key][slot_key]
-            raise Exception(
-                f"Room conflict: {room_key} at {slot_key} already has {existing_block}"
-            )
-
         self.state.room_bookings[room_key][slot_key] = block_id
 
         # Update staff bookings
-        staff_id = block.staff_member.id
-        if staff_id not in self.state.staff_bookings:
-            self.state.staff_bookings[staff_id] = {}
-
-        if slot_key in self.state.staff_bookings[staff_id]:
-            existing_block = self.state.staff_bookings[staff_id][slot_key]
-            raise Exception(
-                f"Staff conflict: {staff_id} at {slot_key} already has {existing_block}"
-            )
-
         self.state.staff_bookings[staff_id][slot_key] = block_id
 
-        # Update other state tracking (unchanged)
-        if block.course_object.course_code not in self.state.course_slots:
-            self.state.course_slots[block.course_object.course_code] = {}
-        self.state.course_slots[block.course_object.course_code][slot_key] = (
-            self.state.course_slots[block.course_object.course_code].get(slot_key, 0)
-            + 1
-        )
+        # Busy masks for the scheduler's bitwise pre-check
+        slot_mask = assignment.time_slot.slot_mask
+        self.state.room_busy[room_key] |= slot_mask
+        self.state.staff_busy[staff_id] |= slot_mask
 
-        level_key = (block.academic_list, block.academic_level)
-        if level_key not in self.state.level_slots:
-            self.state.level_slots[level_key] = {}
-        if assignment.time_slot.day not in self.state.level_slots[level_key]:
-            self.state.level_slots[level_key][assignment.time_slot.day] = []
-        self.state.level_slots[level_key][assignment.time_slot.day].append(
-            assignment.time_slot.start_time
-        )
+        # Update other state tracking
+        self.state.course_slots[block.course_object.course_code][slot_key] += 1
 
-        study_plan_key = (
+        level_key = (
             block.academic_list,
+            block.academic_level,
             assignment.time_slot.day,
-            assignment.time_slot.start_time,
         )
-        if study_plan_key not in self.state.study_plan_slots:
-            self.state.study_plan_slots[study_plan_key] = []
+        # Kept sorted so gap evaluation can read neighbours and extremes directly
+        insort(self.state.level_slots[level_key], assignment.time_slot.start_time)
+
+        study_plan_key = (block.academic_list, slot_key)
         self.state.study_plan_slots[study_plan_key].append(block_id)
+        if block.is_single_group_course:
+            self.state.single_group_slots[study_plan_key] += 1
+
+        plan_course_key = (block.academic_list, slot_key, block.course_code)
+        self.state.plan_course_slots[plan_course_key] += 1
+        if block.total_groups == 1:
+            self.state.plan_course_single_slots[plan_course_key] += 1
+
+    def _remove_from_state(self, block_id: str):
+        """Remove assignment from internal state tracking (inverse of _add_to_state)"""
+        assignment = self.current_assignments.pop(block_id)
+        self.state_version += 1
+
+        block = assignment.block
+        day = assignment.time_slot.day
+        start_time = assignment.time_slot.start_time
+        slot_key = assignment.time_slot.slot_id
+        room_key = get_room_key(assignment.room)
+        staff_id = block.staff_member.id
+
+        self.logger.debug(f"Removing {block_id} from state")
+
+        # Empty containers are dropped so membership tests stay accurate
+        room_slots = self.state.room_bookings[room_key]
+        del room_slots[slot_key]
+        if not room_slots:
+            del self.state.room_bookings[room_key]
+
+        staff_slots = self.state.staff_bookings[staff_id]
+        del staff_slots[slot_key]
+        if not staff_slots:
+            del self.state.staff_bookings[staff_id]
+
+        # Overlapping bookings can share mask bits, so rebuild each busy mask
+        # from the bookings that remain rather than clearing this slot's bits
+        room_busy = self._busy_mask(room_slots)
+        if room_busy:
+            self.state.room_busy[room_key] = room_busy
+        else:
+            self.state.room_busy.pop(room_key, None)
+        staff_busy = self._busy_mask(staff_slots)
+        if staff_busy:
+            self.state.staff_busy[staff_id] = staff_busy
+        else:
+            self.state.staff_busy.pop(staff_id, None)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._verify_busy_masks()
+
+        course_code = block.course_object.course_code
+        course_slots = self.state.course_slots[course_code]
+        course_slots[slot_key] -= 1
+        if not course_slots[slot_key]:
+            del course_slots[slot_key]
+        if not course_slots:
+            del self.state.course_slots[course_code]
+
+        level_key = (block.academic_list, block.academic_level, day)
+        day_slots = self.state.level_slots[level_key]
+        day_slots.remove(start_time)
+        if not day_slots:
+            del self.state.level_slots[level_key]
+
+        study_plan_key = (block.academic_list, slot_key)
+        slot_blocks = self.state.study_plan_slots[study_plan_key]
+        slot_blocks.remove(block_id)
+        if not slot_blocks:
+            del self.state.study_plan_slots[study_plan_key]
+        if block.is_single_group_course:
+            self.state.single_group_slots[study_plan_key] -= 1
+            if not self.state.single_group_slots[study_plan_key]:
+                del self.state.single_group_slots[study_plan_key]
+
+        plan_course_key = (block.academic_list, slot_key, block.course_code)
+        self.state.plan_course_slots[plan_course_key] -= 1
+        if not self.state.plan_course_slots[plan_course_key]:
+            del self.state.plan_course_slots[plan_course_key]
+        if block.total_groups == 1:
+            self.state.plan_course_single_slots[plan_course_key] -= 1
+            if not self.state.plan_course_single_slots[plan_course_key]:
+                del self.state.plan_course_single_slots[plan_course_key]
+
+    def _busy_mask(self, bookings: Dict[int, str]) -> int:
+        """Union of the slot masks of the given {slot_id -> block_id} bookings"""
+        mask = 0
+        for block_id in bookings.values():
+            mask |= self.current_assignments[block_id].time_slot.slot_mask
+        return mask
+
+    def _verify_busy_masks(self):
+        """Check the busy masks against the room and staff booking indices"""
+        for busy, bookings in (
+            (self.state.room_busy, self.state.room_bookings),
+            (self.state.staff_busy, self.state.staff_bookings),
+        ):
+            for key in busy.keys() | bookings.keys():
+                expected = self._busy_mask(bookings.get(key, {}))
+                if busy.get(key, 0) != expected:
+                    raise Exception(
+                        f"Busy mask drift for {key}: {busy.get(key, 0):#x} != {expected:#x}"
+                    )
 
     def _verify_no_conflicts_before_commit(self, new_assignment):
         """Explicitly check for conflicts before adding to state"""
@@ -248,10 +490,10 @@ class ConstraintManager:
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> bool:
         """Check if room is already booked at the given time"""
-        slot_key = (slot.day, slot.start_time)
+        slot_key = slot.slot_id
         room_key = get_room_key(room)  # Returns (room_type, room_id) tuple
 
-        self.logger.debug(f"Checking room booking: {room_key} at {slot_key}")
+        self.logger.debug(f"Checking room booking: {room_key} at {slot}")
 
         # Check if room exists in bookings
         if room_key not in self.state.room_bookings:
@@ -264,10 +506,10 @@ class ConstraintManager:
         if not is_available:
             existing_block = self.state.room_bookings[room_key][slot_key]
             self.logger.debug(
-                f"Room {room_key} at {slot_key} already booked by {existing_block} - CONFLICT"
+                f"Room {room_key} at {slot} already booked by {existing_block} - CONFLICT"
             )
         else:
-            self.logger.debug(f"Room {room_key} at {slot_key} is available")
+            self.logger.debug(f"Room {room_key} at {slot} is available")
 
         return is_available
 
@@ -275,10 +517,10 @@ class ConstraintManager:
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> bool:
         """Check if staff member is already booked at the given time"""
-        slot_key = (slot.day, slot.start_time)
+        slot_key = slot.slot_id
         staff_id = block.staff_member.id
 
-        self.logger.debug(f"Checking staff booking: Staff {staff_id} at {slot_key}")
+        self.logger.debug(f"Checking staff booking: Staff {staff_id} at {slot}")
 
         # Check if staff exists in bookings
         if staff_id not in self.state.staff_bookings:
@@ -291,50 +533,47 @@ class ConstraintManager:
         if not is_available:
             existing_block = self.state.staff_bookings[staff_id][slot_key]
             self.logger.debug(
-                f"Staff {staff_id} at {slot_key} already booked for {existing_block} - CONFLICT"
+                f"Staff {staff_id} at {slot} already booked for {existing_block} - CONFLICT"
             )
         else:
-            self.logger.debug(f"Staff {staff_id} at {slot_key} is available")
+            self.logger.debug(f"Staff {staff_id} at {slot} is available")
 
         return is_available
 
     def setup_constraints(self):
         """Initialize all constraints with their weights and descriptions"""
         # Hard Constraints
-        self.add_hard_constraint(self.check_room_booking, "No double room booking")
-        self.add_hard_constraint(self.check_staff_booking, "No double staff booking")
+        self.add_hard_constraint(self.check_room_booking, NO_DOUBLE_ROOM_BOOKING)
+        self.add_hard_constraint(self.check_staff_booking, NO_DOUBLE_STAFF_BOOKING)
+        self.add_hard_constraint(self.check_room_availability, ROOM_AVAILABILITY)
         self.add_hard_constraint(
-            self.check_room_availability,
-            "Room must be available in the given time slot",
-        )
-        self.add_hard_constraint(
-            self.check_single_group_conflict,
-            "Single group courses cannot have parallel sessions",
-        )
-        self.add_hard_constraint(
-            self.check_lab_requirements,
-            "Lab specialization and preferences must be met",
+            self.check_single_group_conflict, SINGLE_GROUP_CONFLICT
         )
+        self.add_hard_constraint(self.check_lab_requirements, LAB_REQUIREMENTS)
+        # can_assign inlines exactly these; anything added later disables that path
+        self._builtin_hard_constraint_count = len(self.hard_constraints)
 
         # Soft Constraints (with weights)
         self.add_soft_constraint(
             self.evaluate_lecturer_preferences,
-            weight=5.0,
+            weight=LECTURER_PREFERENCE_WEIGHT,
             description="Lecturer timing preferences",
         )
         self.add_soft_constraint(
             self.evaluate_ta_preferences,
-            weight=3.0,
+            weight=TA_PREFERENCE_WEIGHT,
             description="Teaching Assistant timing preferences",
         )
         self.add_soft_constraint(
-            self.evaluate_gaps, weight=2.0, description="Minimize schedule gaps"
+            self.evaluate_gaps, weight=GAPS_WEIGHT, description="Minimize schedule gaps"
         )
         self.add_soft_constraint(
             self.evaluate_room_capacity,
-            weight=1.5,
+            weight=ROOM_CAPACITY_WEIGHT,
             description="Room capacity utilization",
         )
+        # compile_soft_scorer bakes in exactly these; anything added later disables it
+        self._builtin_soft_constraint_count = len(self.soft_constraints)
 
     def add_hard_constraint(self, constraint_func, description: str):
         """Add a hard constraint with its description"""
@@ -348,21 +587,72 @@ class ConstraintManager:
             {"func": constraint_func, "weight": weight, "description": description}
         )
 
+    def has_extra_constraints(self) -> bool:
+        """Whether constraints beyond the built-in ones have been registered"""
+        return (
+            len(self.hard_constraints) != self._builtin_hard_constraint_count
+            or len(self.soft_constraints) != self._builtin_soft_constraint_count
+        )
+
     def evaluate_soft_constraints(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> float:
         """Evaluate all soft constraints and return total weighted score"""
+        if len(self.soft_constraints) == self._builtin_soft_constraint_count:
+            cached = self._soft_scorers.get(block.id)
+            if cached is None or cached[0] is not block:
+                cached = (block, self.compile_soft_scorer(block))
+                self._soft_scorers[block.id] = cached
+            return cached[1](slot, room)
+
         total_score = 0.0
         for constraint in self.soft_constraints:
             score = constraint["func"](block, slot, room)
             total_score += score * constraint["weight"]
         return total_score
 
+    def compile_soft_scorer(self, block) -> Callable[[TimePreference, Room], float]:
+        """
+        Build a scorer specialised to one block for the built-in soft constraints.
+
+        Only the preference term matching the block's staff kind is kept (the
+        other always scores 0.0), so scoring needs no isinstance checks or
+        per-constraint dispatch. Results match evaluate_soft_constraints exactly.
+        """
+        if block.staff_member.staff_kind is StaffKind.LECTURER:
+            preference_weight = LECTURER_PREFERENCE_WEIGHT
+        else:
+            preference_weight = TA_PREFERENCE_WEIGHT
+        pref_slots = block.staff_member._pref_slots
+        pref_mask = block.staff_member.availability_mask
+        evaluate_gaps = self.evaluate_gaps
+        evaluate_room_capacity = self.evaluate_room_capacity
+
+        def score(slot: TimePreference, room: Room) -> float:
+            # Grid-aligned slots test one bit; others fall back to the set
+            start_bit = slot.start_bit
+            if start_bit:
+                preferred = pref_mask & start_bit
+            else:
+                preferred = (slot.day, slot.start_time) in pref_slots
+            total_score = preference_weight if preferred else 0.0
+            total_score += evaluate_gaps(block, slot, room) * GAPS_WEIGHT
+            total_score += (
+                evaluate_room_capacity(block, slot, room) * ROOM_CAPACITY_WEIGHT
+            )
+            return total_score
+
+        return score
+
     # Hard Constraints
     def check_room_availability(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> bool:
         """Check if room is available at the given time based on its availability schedule"""
+        if (slot.day, slot.start_time, slot.end_time) in room._available_slots:
+            return True
+
+        # Fall back to range containment for slots that don't match exactly
         for pref in room.availability:
             if (
                 pref.day == slot.day
@@ -380,53 +670,48 @@ class ConstraintManager:
         A time slot cannot have multiple sessions (lectures or labs) for the same study plan
         if any of the involved courses has a single lecture group.
         """
-        slot_key = (block.academic_list, slot.day, slot.start_time)
-
-        # Check existing assignments for this time slot and study plan
-        if slot_key in self.state.study_plan_slots:
-            # Get all blocks scheduled in this slot for this study plan
-            existing_blocks = []
-            for block_id in self.state.study_plan_slots[slot_key]:
-                # Look up the existing block from assignments
-                for assignment in self.current_assignments.values():
-                    if assignment.block.id == block_id:
-                        existing_blocks.append(assignment.block)
-                        break
-
-            # If current block is from a single-group course, reject any parallel sessions
-            if block.is_single_group_course:
-                return False
+        slot_key = (block.academic_list, slot.slot_id)
 
-            # Check if any existing block is from a single-group course
-            for existing_block in existing_blocks:
-                if existing_block.is_single_group_course:
-                    return False
+        # Nothing scheduled in this time slot for this study plan
+        if slot_key not in self.state.study_plan_slots:
+            return True
 
-                # Check if current block and existing block are from the same course
-                if existing_block.course_code == block.course_object.course_code:
-                    # For same course, ensure both blocks allow parallel sessions
-                    if block.total_groups == 1 or existing_block.total_groups == 1:
-                        return False
+        # If current block is from a single-group course, reject any parallel sessions
+        if block.is_single_group_course:
+            return False
 
-        return True
+        # Check if any existing block is from a single-group course
+        if self.state.single_group_slots.get(slot_key):
+            return False
+
+        # Same-course blocks in this slot may only run in parallel if both
+        # allow it; per-course counters answer that without visiting blocks
+        plan_course_key = (
+            block.academic_list,
+            slot.slot_id,
+            block.course_object.course_code,
+        )
+        if block.total_groups == 1:
+            return not self.state.plan_course_slots.get(plan_course_key)
+        return not self.state.plan_course_single_slots.get(plan_course_key)
 
     def check_lab_requirements(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> bool:
         """Check lab specialization and preferences"""
         if block.required_room_type == "lab":
-            if not isinstance(room, Lab):
+            if not room.is_lab:
                 return False
 
             # Check preferred labs
             if block.preferred_rooms:
-                return room in block.preferred_rooms
+                return room in block._preferred_room_set
 
             # Check lab specialization
             if not room.used_in_non_specialist_courses:
                 return False
 
-        elif block.required_room_type == "hall" and not isinstance(room, Hall):
+        elif block.required_room_type == "hall" and room.is_lab:
             return False
 
         return True
@@ -480,50 +765,48 @@ class ConstraintManager:
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> float:
         """Score lecturer timing preferences"""
-        if not isinstance(block.staff_member, Lecturer):
+        if block.staff_member.staff_kind is not StaffKind.LECTURER:
             return 0.0
 
-        for pref in block.staff_member.timing_preferences:
-            if pref.day == slot.day and pref.start_time == slot.start_time:
-                return 1.0
+        if block.staff_member.prefers(slot):
+            return 1.0
         return 0.0
 
     def evaluate_ta_preferences(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> float:
         """Score teaching assistant timing preferences"""
-        if not isinstance(block.staff_member, TeachingAssistant):
+        if block.staff_member.staff_kind is not StaffKind.TEACHING_ASSISTANT:
             return 0.0
 
-        for pref in block.staff_member.timing_preferences:
-            if pref.day == slot.day and pref.start_time == slot.start_time:
-                return 1.0
+        if block.staff_member.prefers(slot):
+            return 1.0
         return 0.0
 
     def evaluate_gaps(
         self, block, slot: TimePreference, room: Union[Hall, Lab]
     ) -> float:
         """Score schedule gaps (fewer gaps is better)"""
-        level_key = (block.academic_list, block.academic_level)
-        if level_key not in self.state.level_slots:
-            return 1.0
-
-        if slot.day not in self.state.level_slots[level_key]:
+        # Sorted on insert; absent when the level has nothing on this day
+        day_slots = self.state.level_slots.get(
+            (block.academic_list, block.academic_level, slot.day)
+        )
+        if not day_slots:
             return 1.0
 
-        day_slots = sorted(self.state.level_slots[level_key][slot.day])
-
-        # Check gaps between existing slots
-        max_gap = 0
-        for i in range(len(day_slots) - 1):
-            gap = day_slots[i + 1].hour - day_slots[i].hour
-            max_gap = max(max_gap, gap)
+        # Include potential new slot (distance to the day's first and last slots)
+        hour = slot.start_time.hour
+        max_gap = max(abs(hour - day_slots[0].hour), abs(hour - day_slots[-1].hour))
+        if max_gap > 4:
+            return 0.0
 
-        # Include potential new slot
-        if day_slots:
-            before_gap = abs(slot.start_time.hour - min(t.hour for t in day_slots))
-            after_gap = abs(slot.start_time.hour - max(t.hour for t in day_slots))
-            max_gap = max(max_gap, before_gap, after_gap)
+        # Check gaps between existing slots in a single pass
+        prev_hour = day_slots[0].hour
+        for start_time in day_slots:
+            gap = start_time.hour - prev_hour
+            if gap > max_gap:
+                max_gap = gap
+            prev_hour = start_time.hour
 
         # Score inversely to gap size (larger gaps = lower score)
         if max_gap <= 2:  # 2-hour gap is acceptable
@@ -8,7 +8,7 @@ from typing import Dict, List, Set, Tuple, Union
 
 from models.halls import Hall
 from models.labs import Lab
-from models.staff_members import StaffMember, TeachingAssistant
+from models.staff_members import StaffKind, StaffMember
 from models.time_preferences import Day, TimePreference
 from utils.room_utils import get_room_key
 
@@ -50,6 +50,10 @@ class ResourceManager:
         self.room_usage = defaultdict(int)  # Change: single dict with composite keys
         self.staff_workload = defaultdict(int)
 
+        # (is_lab, student_count, ratio) -> suitable shared rooms; blocks of a
+        # course share a size, so most lookups repeat
+        self._suitable_rooms_cache: Dict[Tuple, Tuple[Union[Hall, Lab], ...]] = {}
+
     def _categorize_labs(self):
         """Categorize labs into general and specialist pools"""
         for lab_id, lab in self.labs.items():
@@ -77,7 +81,7 @@ class ResourceManager:
             current_time = day_start
             while current_time.hour + self.time_slot_duration <= day_end.hour:
                 # Skip Monday 1-3 PM slot (prayer time)
-                if day == Day.MONDAY and current_time.hour in [13, 14]:
+                if day is Day.MONDAY and current_time.hour in (13, 14):
                     current_time = time(current_time.hour + 1, 0)
                     continue
 
@@ -104,34 +108,46 @@ class ResourceManager:
     ) -> List[Union[Hall, Lab]]:
         """Get suitable rooms for a block based on type and capacity requirements"""
         required_capacity = block.student_count
-        suitable_rooms = []
-
-        if block.required_room_type == "lab":
-            # Handle lab requirements
-            if block.preferred_rooms:
-                # Only use preferred labs - FIX: use the labs directly
-                suitable_rooms = [
-                    lab  # Changed: use lab directly, not self.labs[lab.id]
-                    for lab in block.preferred_rooms
-                    if lab.capacity >= (required_capacity * preferred_capacity_ratio)
-                ]
-            else:
-                # Use general labs
-                suitable_rooms = [
-                    lab
-                    for lab in self.labs.values()
-                    if (
-                        lab.used_in_non_specialist_courses
-                        and lab.capacity
-                        >= (required_capacity * preferred_capacity_ratio)
-                    )
-                ]
+        is_lab = block.required_room_type == "lab"
+
+        if is_lab and block.preferred_rooms:
+            # Preferred labs are per course, so they bypass the shared cache
+            suitable_rooms = [
+                lab
+                for lab in block.preferred_rooms
+                if lab.capacity >= (required_capacity * preferred_capacity_ratio)
+            ]
+            return sorted(
+                suitable_rooms, key=lambda r: abs(r.capacity - required_capacity)
+            )
+
+        key = (is_lab, required_capacity, preferred_capacity_ratio)
+        rooms = self._suitable_rooms_cache.get(key)
+        if rooms is None:
+            rooms = tuple(
+                self._filter_shared_rooms(
+                    is_lab, required_capacity, preferred_capacity_ratio
+                )
+            )
+            self._suitable_rooms_cache[key] = rooms
+        return list(rooms)
+
+    def _filter_shared_rooms(
+        self, is_lab: bool, required_capacity: int, preferred_capacity_ratio: float
+    ) -> List[Union[Hall, Lab]]:
+        """Halls, or general-use labs, big enough for required_capacity"""
+        min_capacity = required_capacity * preferred_capacity_ratio
+        if is_lab:
+            # Use general labs
+            suitable_rooms = [
+                lab
+                for lab in self.labs.values()
+                if lab.used_in_non_specialist_courses and lab.capacity >= min_capacity
+            ]
         else:
             # Handle hall requirements
             suitable_rooms = [
-                hall
-                for hall in self.halls.values()
-                if hall.capacity >= (required_capacity * preferred_capacity_ratio)
+                hall for hall in self.halls.values() if hall.capacity >= min_capacity
             ]
 
         # Sort rooms by optimal capacity utilization
@@ -141,44 +157,41 @@ class ResourceManager:
         self, block, room: Union[Hall, Lab], existing_assignments: Dict
     ) -> List[TimePreference]:
         """Get available time slots for a block in a specific room"""
-        available_slots = []
-
-        # Get room's base availability
-        base_slots = set((slot.day, slot.start_time) for slot in room.availability)
-
         # Remove slots that are already assigned
-        used_slots = set()
-        for assignment in existing_assignments.values():
-            if assignment.room == room:
-                used_slots.add(
-                    (assignment.time_slot.day, assignment.time_slot.start_time)
-                )
-
-        # Get staff member's availability
-        staff_slots = set(
-            (slot.day, slot.start_time)
-            for slot in block.staff_member.timing_preferences
-        )
+        room_key = get_room_key(room)
+        used_slots = {
+            (assignment.time_slot.day, assignment.time_slot.start_time)
+            for assignment in existing_assignments.values()
+            if get_room_key(assignment.room) == room_key
+        }
 
-        # Find available slots (intersection of all constraints)
-        available_slot_tuples = base_slots - used_slots
-        if isinstance(block.staff_member, TeachingAssistant):
-            # For TAs, prefer their available slots but don't restrict to them
-            available_slot_tuples = sorted(
-                available_slot_tuples, key=lambda x: x in staff_slots, reverse=True
-            )
-        else:
-            # For lecturers, strictly follow their preferences
-            available_slot_tuples = available_slot_tuples.intersection(staff_slots)
+        # Walk the room's availability in order; staff preference is one AND
+        # against the staff member's start-time mask per slot
+        staff_member = block.staff_member
+        # For lecturers, strictly follow their preferences; TAs prefer their
+        # available slots but aren't restricted to them
+        strict = staff_member.staff_kind is not StaffKind.TEACHING_ASSISTANT
+        preferred, others = [], []
+        for slot in room.availability:
+            slot_key = (slot.day, slot.start_time)
+            if slot_key in used_slots:
+                continue
+            used_slots.add(slot_key)
+            if staff_member.prefers(slot):
+                preferred.append(slot_key)
+            elif not strict:
+                others.append(slot_key)
 
         # Convert back to TimePreference objects
-        for day, start_time in available_slot_tuples:
-            end_time = time(start_time.hour + self.time_slot_duration, 0)
-            available_slots.append(
-                TimePreference(day=day, start_time=start_time, end_time=end_time)
+        duration = self.time_slot_duration
+        return [
+            TimePreference(
+                day=day,
+                start_time=start_time,
+                end_time=time(start_time.hour + duration, 0),
             )
-
-        return available_slots
+            for day, start_time in preferred + others
+        ]
 
     def update_resource_usage(self, assignment):
         """Update usage statistics after making an assignment"""
@@ -1,13 +1,20 @@
 # models/academic_list.py
 
 
+import logging
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from models.department import Department
 
+logger = logging.getLogger("models.academic_list")
 
-@dataclass
+# Positional Course fields, in declaration order
+CourseRow = Tuple[int, str, str, Optional[str], int, int, int, Optional[str]]
+
+
+@dataclass(frozen=True, slots=True)
 class Course:
     id: int
     code: str
@@ -18,30 +25,71 @@ class Course:
     credit_hours: int
     prerequisite_course: Optional[str] = None
 
-    def __post_init__(self):
-        if self.lecture_hours < 0 or self.practical_hours < 0 or self.credit_hours < 0:
-            raise ValueError("Hours cannot be negative")
-        if self.credit_hours != self.lecture_hours + (self.practical_hours / 2):
-            raise ValueError(
-                "Credit hours cannot be less than sum of lecture and practical hours"
+    def __post_init__(self) -> None:
+        # Range/consistency checks; the compiler drops this block under -O
+        if __debug__:
+            # credit_hours >= 0 follows from the other two checks
+            if self.lecture_hours < 0 or self.practical_hours < 0:
+                raise ValueError("Hours cannot be negative")
+            if self.credit_hours != self.lecture_hours + (self.practical_hours / 2):
+                raise ValueError(
+                    "Credit hours cannot be less than sum of lecture and practical hours"
+                )
+
+        # Codes are compared and used as keys all over scheduling
+        if isinstance(self.code, str):
+            object.__setattr__(self, "code", sys.intern(self.code))
+        if isinstance(self.prerequisite_course, str):
+            object.__setattr__(
+                self, "prerequisite_course", sys.intern(self.prerequisite_course)
             )
 
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @classmethod
+    def _from_row(cls, row: CourseRow) -> "Course":
+        """Build a Course from a positional row, avoiding keyword matching"""
+        return cls(*row)
 
-@dataclass
+
+@dataclass(slots=True)
 class AcademicList:
     id: int
     name: str
     department: Department
     courses: List[Course] = field(default_factory=list)
+    _by_code: Dict[str, Course] = field(init=False, repr=False, compare=False)
 
-    def __post_init__(self):
-        if not self.name.strip():
+    def __post_init__(self) -> None:
+        if not self.name or self.name.isspace():
             raise ValueError("Academic list must have a name")
         if not self.courses:
             raise ValueError("Academic list must have at least one course")
+        # Blocks carry the list name into every study-plan slot key
+        self.name = sys.intern(self.name)
+
+        # code -> course for O(1) lookups; a repeated code from the API is
+        # logged and dropped so the first occurrence wins
+        by_code = {}
+        for course in self.courses:
+            if course.code in by_code:
+                logger.warning(
+                    "Dropping duplicate course code %s in academic list %s",
+                    course.code,
+                    self.name,
+                )
+                continue
+            by_code[course.code] = course
+        if len(by_code) != len(self.courses):
+            self.courses = list(by_code.values())
+        self._by_code = by_code
+
+    def get(self, code: str) -> Optional[Course]:
+        return self._by_code.get(code)
 
 
-def print_course(course: Course):
+def print_course(course: Course) -> None:
     print(
         f"- {course.name_en} ({course.code}): "
         f"{course.lecture_hours} lecture hours / {course.practical_hours} practical hours / {course.credit_hours} credit hours "
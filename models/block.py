@@ -1,8 +1,8 @@
 # models/block.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Union
+from typing import FrozenSet, List, Optional, Tuple, Union
 
 from models.academic_list import AcademicList, Course
 from models.halls import Hall
@@ -17,7 +17,7 @@ class BlockType(Enum):
     LAB = "lab"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Block:
     id: str  # unique identifier
     course_code: str
@@ -34,9 +34,24 @@ class Block:
     academic_level: int
     practical_in_lab: bool = True
     preferred_rooms: Optional[List[Union[Hall, Lab]]] = None
-
-
-@dataclass
+    _preferred_room_set: FrozenSet[Union[Hall, Lab]] = field(
+        init=False, repr=False, compare=False
+    )
+    is_lecture: bool = field(init=False, repr=False, compare=False)
+    # (type, course) ordering used when listing a time slot's sessions
+    _sort_key: Tuple[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Hashed copy of preferred_rooms for O(1) membership checks; the list
+        # keeps its order for room iteration
+        object.__setattr__(
+            self, "_preferred_room_set", frozenset(self.preferred_rooms or ())
+        )
+        object.__setattr__(self, "is_lecture", self.block_type == BlockType.LECTURE)
+        object.__setattr__(self, "_sort_key", (self.block_type.value, self.course_code))
+
+
+@dataclass(frozen=True, slots=True)
 class Assignment:
     block: Block
     time_slot: TimePreference
@@ -1,12 +1,30 @@
 # models/department.py
 
+import sys
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Department:
     id: int
     name: str
 
-    def __str__(self):
+    def __post_init__(self) -> None:
+        # Each staff member and academic list repeats one of a few names
+        if isinstance(self.name, str):
+            object.__setattr__(self, "name", sys.intern(self.name))
+
+    def __eq__(self, other: object) -> bool:
+        # API conversion shares one instance per department, so identity
+        # usually decides; otherwise compare the int id before the name
+        if self is other:
+            return True
+        if other.__class__ is not Department:
+            return NotImplemented
+        return self.id == other.id and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
         return self.name
@@ -1,24 +1,41 @@
 # models/halls.py
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from datetime import time
+from typing import FrozenSet, List, Tuple
 
-from models.time_preferences import BaseAvailability, TimePreference
+from models.time_preferences import Day, TimePreference
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Hall:
     id: int
     name: str
     capacity: int
-    availability: List[TimePreference]
+    availability: Tuple[TimePreference, ...]
+    _available_slots: FrozenSet[Tuple[Day, time, time]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    is_lab = False
+
+    def __post_init__(self) -> None:
+        # Frozen: store availability as a tuple so shared slot lists stay read-only
+        object.__setattr__(self, "availability", tuple(self.availability))
 
-    def __post_init__(self):
         if self.capacity <= 0:
             raise ValueError("Hall capacity must be positive")
         if not self.availability:
             raise ValueError("Hall must have at least one availability slot")
 
+        # (day, start, end) keys for O(1) exact-slot availability checks
+        object.__setattr__(
+            self,
+            "_available_slots",
+            frozenset(
+                (slot.day, slot.start_time, slot.end_time) for slot in self.availability
+            ),
+        )
 
-if __name__ == "__main__":
-    pass
+    def __hash__(self) -> int:
+        return hash(self.id)
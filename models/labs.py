@@ -1,11 +1,20 @@
 # models/labs.py
 
 
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
+from datetime import time
 from enum import Enum
-from typing import List
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet, List, Tuple
 
-from models.time_preferences import BaseAvailability, TimePreference
+try:
+    import orjson
+except ImportError:  # optional: faster JSON parsing
+    orjson = None
+
+from models.time_preferences import BaseAvailability, Day, TimePreference
 
 
 class LabType(Enum):
@@ -13,149 +22,65 @@ class LabType(Enum):
     SPECIALIST = "specialist"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Lab:
     id: int
     name: str
     capacity: int
-    availability: List[TimePreference]
+    availability: Tuple[TimePreference, ...]
     lab_type: LabType
     used_in_non_specialist_courses: bool = True
+    _available_slots: FrozenSet[Tuple[Day, time, time]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    is_lab = True
+
+    def __post_init__(self) -> None:
+        # Frozen: store availability as a tuple so shared slot lists stay read-only
+        object.__setattr__(self, "availability", tuple(self.availability))
 
-    def __post_init__(self):
         if self.capacity <= 0:
             raise ValueError("Lab capacity must be positive")
         if not self.availability:
             raise ValueError("Lab must have at least one availability slot")
 
+        # (day, start, end) keys for O(1) exact-slot availability checks
+        object.__setattr__(
+            self,
+            "_available_slots",
+            frozenset(
+                (slot.day, slot.start_time, slot.end_time) for slot in self.availability
+            ),
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
 
 # Labs Seeding
 
-L401 = Lab(
-    1, "401", 25, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L402 = Lab(
-    2, "402", 25, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L403 = Lab(3, "403", 23, BaseAvailability.generate_base_availability(), LabType.GENERAL)
-L407 = Lab(
-    4, "407", 36, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L408 = Lab(
-    5, "408", 23, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L409 = Lab(
-    6, "409", 22, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L410 = Lab(
-    7,
-    "410",
-    15,
-    BaseAvailability.generate_base_availability(),
-    LabType.SPECIALIST,
-    False,
-)
-L411 = Lab(
-    8, "411", 25, BaseAvailability.generate_base_availability(), LabType.SPECIALIST
-)
-L412 = Lab(
-    9,
-    "412",
-    12,
-    BaseAvailability.generate_base_availability(),
-    LabType.SPECIALIST,
-    False,
-)
-L413 = Lab(
-    23,
-    "413",
-    25,
-    BaseAvailability.generate_base_availability(),
-    LabType.SPECIALIST,
-    False,
-)
-
-L201 = Lab(
-    10, "201", 33, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L202 = Lab(
-    11, "202", 24, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L203 = Lab(
-    12, "203", 25, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L204 = Lab(
-    13, "204", 25, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L205 = Lab(
-    14, "205", 28, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L206 = Lab(
-    15,
-    "206",
-    10,
-    BaseAvailability.generate_base_availability(),
-    LabType.SPECIALIST,
-    False,
-)
-L207 = Lab(
-    16, "207", 38, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L208 = Lab(
-    17, "208", 25, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L209 = Lab(
-    18, "209", 24, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L210 = Lab(
-    19, "210", 25, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L211 = Lab(
-    20, "211", 24, BaseAvailability.generate_base_availability(), LabType.GENERAL
-)
-L213 = Lab(
-    21,
-    "213",
-    25,
-    BaseAvailability.generate_base_availability(),
-    LabType.SPECIALIST,
-    False,
-)
-L214 = Lab(
-    22,
-    "214",
-    25,
-    BaseAvailability.generate_base_availability(),
-    LabType.GENERAL,
-)
-
-Labs = [
-    L401,
-    L402,
-    L403,
-    L407,
-    L408,
-    L409,
-    L410,
-    L411,
-    L412,
-    L413,
-    L201,
-    L202,
-    L203,
-    L204,
-    L205,
-    L206,
-    L207,
-    L208,
-    L209,
-    L210,
-    L211,
-    L213,
-    L214,
-]
+
+_SEED_LABS_FILE = Path(__file__).with_name("seed_labs.json")
+
+
+@lru_cache(maxsize=1)
+def get_seed_labs() -> Tuple[Lab, ...]:
+    """Build the seeded labs once, sharing the base availability tuple.
+
+    Rows in seed_labs.json are
+    [id, name, capacity, lab_type, used_in_non_specialist_courses].
+    """
+    raw = _SEED_LABS_FILE.read_bytes()
+    rows = orjson.loads(raw) if orjson else json.loads(raw)
+    base = BaseAvailability.generate_base_availability()
+    return tuple(
+        Lab(lab_id, name, capacity, base, LabType(lab_type), non_specialist)
+        for lab_id, name, capacity, lab_type, non_specialist in rows
+    )
+
 
 if __name__ == "__main__":
     print("Labs:")
-    for lab in Labs:
+    for lab in get_seed_labs():
         print(lab)
@@ -6,7 +6,7 @@ from typing import Dict, Set
 from models.block import Assignment
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulingAttempt:
     """Represents a single scheduling attempt with its score"""
 
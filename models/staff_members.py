@@ -1,67 +1,162 @@
 # models/staff_members.py
 
 
-from dataclasses import dataclass
-from typing import List
+import sys
+from dataclasses import dataclass, field
+from datetime import time
+from enum import IntEnum
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 from models.department import Department
-from models.time_preferences import BaseAvailability, Day, TimePreference
+from models.time_preferences import Day, TimePreference
 
 
-@dataclass
+class StaffKind(IntEnum):
+    LECTURER = 0
+    TEACHING_ASSISTANT = 1
+
+
+_LECTURER_DEGREES: FrozenSet[int] = frozenset(
+    {
+        1,  # استاذ
+        2,  # استاذ مساعد
+        3,  # مدرس
+    }
+)
+_TA_DEGREES: FrozenSet[int] = frozenset({4, 5})
+
+_LECTURER_DEGREES_MSG = ", ".join(str(d) for d in sorted(_LECTURER_DEGREES))
+_TA_DEGREES_MSG = ", ".join(str(d) for d in sorted(_TA_DEGREES))
+
+# Bit i set <=> degree id i allowed; validation is a shift and a mask
+_LECTURER_DEGREE_MASK = sum(1 << d for d in _LECTURER_DEGREES)
+_TA_DEGREE_MASK = sum(1 << d for d in _TA_DEGREES)
+
+
+@dataclass(frozen=True, slots=True)
 class AcademicDegree:
     id: int
     name: str
     prefix: str
 
-    def __str__(self):
+    def __eq__(self, other: object) -> bool:
+        # Shared per payload like Department; identity first, then the int id
+        if self is other:
+            return True
+        if other.__class__ is not AcademicDegree:
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.name == other.name
+            and self.prefix == other.prefix
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
         return self.name
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StaffMember:
     id: int
     name: str
     department: Department
-    timing_preferences: List[TimePreference]
+    timing_preferences: Sequence[TimePreference]
     academic_degree: AcademicDegree
     is_permanent: bool
-
-    def __post_init__(self):
-        if not self.name.strip():
+    _pref_slots: FrozenSet[Tuple[Day, time]] = field(
+        init=False, repr=False, compare=False
+    )
+    # Union of the preferred slots' start bits (grid-aligned starts only)
+    availability_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.name or self.name.isspace():
             raise ValueError("Staff member must have a name")
-        self._validate_academic_degree()
+        # Degree ids come from a fixed lookup table; checked in debug runs only
+        if __debug__:
+            self._validate_academic_degree()
+        object.__setattr__(self, "name", sys.intern(self.name))
+
+        # (day, start) keys for O(1) timing preference lookups
+        object.__setattr__(
+            self,
+            "_pref_slots",
+            frozenset((pref.day, pref.start_time) for pref in self.timing_preferences),
+        )
+        availability_mask = 0
+        for pref in self.timing_preferences:
+            availability_mask |= pref.start_bit
+        object.__setattr__(self, "availability_mask", availability_mask)
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def prefers(self, slot: TimePreference) -> bool:
+        """Whether slot starts at one of this staff member's preferred times"""
+        if slot.start_bit:
+            return bool(self.availability_mask & slot.start_bit)
+        return (slot.day, slot.start_time) in self._pref_slots
 
-    def _validate_academic_degree(self):
+    def _validate_academic_degree(self) -> None:
         raise NotImplementedError(
             "Subclasses must implement academic degree validation"
         )
 
 
 class Lecturer(StaffMember):
-    ALLOWED_DEGREES = {
-        1,  # استاذ
-        2,  # استاذ مساعد
-        3,  # مدرس
-    }
+    __slots__ = ()
 
-    def _validate_academic_degree(self):
-        if self.academic_degree.id not in self.ALLOWED_DEGREES:
+    staff_kind = StaffKind.LECTURER
+
+    ALLOWED_DEGREES = _LECTURER_DEGREES
+
+    def _validate_academic_degree(self) -> None:
+        degree_id = self.academic_degree.id
+        if degree_id < 0 or not (_LECTURER_DEGREE_MASK >> degree_id) & 1:
             raise ValueError(
                 f"Invalid academic degree for lecturer: {self.academic_degree}. "
-                f"Must be one of: {', '.join(degree.value for degree in self.ALLOWED_DEGREES)}"
+                f"Must be one of: {_LECTURER_DEGREES_MSG}"
             )
 
 
 class TeachingAssistant(StaffMember):
-    ALLOWED_DEGREES = {
-        4,
-        5,
-    }
+    __slots__ = ()
+
+    staff_kind = StaffKind.TEACHING_ASSISTANT
 
-    def _validate_academic_degree(self):
-        if self.academic_degree.id not in self.ALLOWED_DEGREES:
+    ALLOWED_DEGREES = _TA_DEGREES
+
+    def _validate_academic_degree(self) -> None:
+        degree_id = self.academic_degree.id
+        if degree_id < 0 or not (_TA_DEGREE_MASK >> degree_id) & 1:
             raise ValueError(
                 f"Invalid academic degree for assistant: {self.academic_degree}. "
-                f"Must be one of: {', '.join(degree.value for degree in self.ALLOWED_DEGREES)}"
+                f"Must be one of: {_TA_DEGREES_MSG}"
             )
+
+
+class StaffRegistry:
+    """Read-only index over a staff list for lookups by id and department"""
+
+    __slots__ = ("members", "_by_id", "_by_department")
+
+    def __init__(self, members: Iterable[StaffMember]) -> None:
+        self.members: Tuple[StaffMember, ...] = tuple(members)
+        # Keep the first member for an id, matching a front-to-back scan
+        self._by_id: Dict[int, StaffMember] = {}
+        self._by_department: Dict[Department, List[StaffMember]] = {}
+        for member in self.members:
+            self._by_id.setdefault(member.id, member)
+            self._by_department.setdefault(member.department, []).append(member)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def get(self, staff_id: int) -> Optional[StaffMember]:
+        return self._by_id.get(staff_id)
+
+    def in_department(self, department: Department) -> List[StaffMember]:
+        return list(self._by_department.get(department, ()))
@@ -1,82 +1,112 @@
 # models/study_plan.py
 
 
-from dataclasses import dataclass
-from typing import List, Optional, TypedDict
+import sys
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import TYPE_CHECKING, List, Optional, Tuple, TypedDict
 
-from models.academic_list import AcademicList
-from models.labs import Lab
-from models.staff_members import *
+# Only needed for annotations; skip importing these modules at runtime
+if TYPE_CHECKING:
+    from models.academic_list import AcademicList
+    from models.labs import Lab
+    from models.staff_members import Lecturer, TeachingAssistant
 
 
 # Define TypedDicts for better type hints
 class LecturerAssignment(TypedDict):
-    lecturer: Lecturer
+    lecturer: "Lecturer"
     num_of_groups: int
 
 
 class TAAssignment(TypedDict):
-    teaching_assistant: TeachingAssistant
+    teaching_assistant: "TeachingAssistant"
     num_of_groups: int
 
 
-@dataclass
+_num_of_groups = itemgetter("num_of_groups")
+
+# Validation error messages
+_ERR_NO_LECTURE_GROUPS = "Must have at least one lecture group"
+_ERR_NO_LECTURERS = "Must have at least one lecturer assigned"
+_ERR_LECTURER_SUM = "Sum of lecturer groups ({}) must equal total lecture groups ({})"
+_ERR_NO_TAS = "Must assign teaching assistants if lab groups exist"
+_ERR_TA_SUM = "Sum of teaching assistant groups ({}) must equal total lab groups ({})"
+_ERR_LEVEL = "Academic level must be positive"
+_ERR_STUDENTS = "Expected students must be positive"
+_ERR_NO_COURSES = "Study plan must have at least one course assignment"
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=False)
 class CourseAssignment:
     course_id: int
     course_code: str
     lecture_groups: int
     lecturers: List[LecturerAssignment]
-    lab_groups: Optional[int] = 0
+    lab_groups: int = 0
     teaching_assistants: Optional[List[TAAssignment]] = None
     practical_in_lab: bool = True
-    preferred_labs: Optional[List[Lab]] = None
+    preferred_labs: Optional[List["Lab"]] = None
     is_common: bool = False
+    # Group counts split out of the assignment records for cheap totals
+    lecturer_group_counts: Tuple[int, ...] = field(
+        init=False, repr=False, compare=False
+    )
+    ta_group_counts: Tuple[int, ...] = field(init=False, repr=False, compare=False)
 
-    def __post_init__(self):
+    def __post_init__(self) -> None:
         # Basic validation
         if self.lecture_groups <= 0:
-            raise ValueError("Must have at least one lecture group")
+            raise ValueError(_ERR_NO_LECTURE_GROUPS)
         if not self.lecturers:
-            raise ValueError("Must have at least one lecturer assigned")
+            raise ValueError(_ERR_NO_LECTURERS)
 
-        # Validate total lecturer groups matches lecture_groups
-        total_lecturer_groups = sum(
-            assignment["num_of_groups"] for assignment in self.lecturers
+        object.__setattr__(self, "course_code", sys.intern(self.course_code))
+        object.__setattr__(
+            self, "lecturer_group_counts", tuple(map(_num_of_groups, self.lecturers))
+        )
+        object.__setattr__(
+            self,
+            "ta_group_counts",
+            tuple(map(_num_of_groups, self.teaching_assistants or ())),
         )
-        if total_lecturer_groups != self.lecture_groups:
-            raise ValueError(
-                f"Sum of lecturer groups ({total_lecturer_groups}) "
-                f"must equal total lecture groups ({self.lecture_groups})"
-            )
 
         # Validate teaching assistants if lab groups exist
-        if self.lab_groups > 0:
-            if not self.teaching_assistants:
-                raise ValueError("Must assign teaching assistants if lab groups exist")
-
-            # Validate total teaching assistant groups matches lab_groups
-            total_ta_groups = sum(
-                assignment["num_of_groups"] for assignment in self.teaching_assistants
-            )
-            if total_ta_groups != self.lab_groups:
+        if self.lab_groups > 0 and not self.teaching_assistants:
+            raise ValueError(_ERR_NO_TAS)
+
+        # Group-sum consistency checks; the compiler drops this block under -O
+        if __debug__:
+            # Validate total lecturer groups matches lecture_groups
+            total_lecturer_groups = sum(self.lecturer_group_counts)
+            if total_lecturer_groups != self.lecture_groups:
                 raise ValueError(
-                    f"Sum of teaching assistant groups ({total_ta_groups}) "
-                    f"must equal total lab groups ({self.lab_groups})"
+                    _ERR_LECTURER_SUM.format(total_lecturer_groups, self.lecture_groups)
                 )
 
+            # Validate total teaching assistant groups matches lab_groups
+            if self.lab_groups > 0:
+                total_ta_groups = sum(self.ta_group_counts)
+                if total_ta_groups != self.lab_groups:
+                    raise ValueError(
+                        _ERR_TA_SUM.format(total_ta_groups, self.lab_groups)
+                    )
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StudyPlan:
     name: str
-    academic_list: AcademicList
+    academic_list: "AcademicList"
     academic_level: int
     expected_students: int
     course_assignments: List[CourseAssignment]
 
-    def __post_init__(self):
-        if self.academic_level < 1:
-            raise ValueError("Academic level must be positive")
-        if self.expected_students <= 0:
-            raise ValueError("Expected students must be positive")
+    def __post_init__(self) -> None:
+        # Range checks; the compiler drops this block under -O
+        if __debug__:
+            if self.academic_level < 1:
+                raise ValueError(_ERR_LEVEL)
+            if self.expected_students <= 0:
+                raise ValueError(_ERR_STUDENTS)
         if not self.course_assignments:
-            raise ValueError("Study plan must have at least one course assignment")
+            raise ValueError(_ERR_NO_COURSES)
@@ -1,13 +1,13 @@
 # models/time_preferences.py
 
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import time
-from enum import Enum
-from typing import Dict, List
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
 
 
-class Day(Enum):
+class Day(IntEnum):
     SUNDAY = 0
     MONDAY = 1
     TUESDAY = 2
@@ -17,59 +17,72 @@ class Day(Enum):
     SATURDAY = 6
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimePreference:
     day: Day
     start_time: time
     end_time: time
-
-    def __str__(self):
-        return (
-            f"{self.day.name}: {self.start_time.strftime('%I:%M %p')} - "
-            f"{self.end_time.strftime('%I:%M %p')}"
+    # Single int encoding of (day, start_time), used as a cheap dict key
+    slot_id: int = field(init=False, repr=False, compare=False)
+    # Week bitmask of the half-hour units this slot covers
+    slot_mask: int = field(init=False, repr=False, compare=False)
+    # Bit of the half-hour unit the slot starts in; 0 when the start is off
+    # the half-hour grid and the bit would be ambiguous
+    start_bit: int = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+    # Display label, formatted on first use and reused by later prints
+    _label: Optional[str] = field(init=False, default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Day is an IntEnum, so it multiplies as a plain int
+        slot_id = self.day * 1440 + self.start_time.hour * 60 + self.start_time.minute
+        end_minute = self.end_time.hour * 60 + self.end_time.minute
+        units = max(1, -(-(end_minute - slot_id % 1440) // 30))
+        object.__setattr__(self, "slot_id", slot_id)
+        object.__setattr__(self, "slot_mask", ((1 << units) - 1) << (slot_id // 30))
+        object.__setattr__(
+            self, "start_bit", 0 if slot_id % 30 else 1 << (slot_id // 30)
         )
-
-    def __hash__(self):
-        return hash((self.day, self.start_time, self.end_time))
+        # Same fields as __eq__ compares, folded into two ints
+        object.__setattr__(self, "_hash", hash((slot_id, end_minute)))
+
+    def __str__(self) -> str:
+        label = self._label
+        if label is None:
+            label = (
+                f"{self.day.name}: {self.start_time.strftime('%I:%M %p')} - "
+                f"{self.end_time.strftime('%I:%M %p')}"
+            )
+            object.__setattr__(self, "_label", label)
+        return label
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+# Weekly teaching grid: two-hour slots from 9 AM, the last ending by 7 PM
+_TEACHING_DAYS = (Day.SUNDAY, Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY, Day.THURSDAY)
+_SLOT_START_HOURS = (9, 11, 13, 15, 17)
+_SLOT_HOURS = 2
+
+# Built once at import and shared by every caller; Monday 1-3 PM stays free
+_BASE_SLOTS: Tuple[TimePreference, ...] = tuple(
+    TimePreference(
+        day=day, start_time=time(hour, 0), end_time=time(hour + _SLOT_HOURS, 0)
+    )
+    for day in _TEACHING_DAYS
+    for hour in _SLOT_START_HOURS
+    if not (day is Day.MONDAY and hour == 13)
+)
 
 
 class BaseAvailability:
     @staticmethod
-    def generate_base_availability() -> List[TimePreference]:
-        # Define start and end times for the day
-        day_start = time(9, 0)  # 9 AM
-        day_end = time(19, 0)  # 7 PM
-        slot_duration = 2  # 2 hours per slot
-
-        availability = []
-
-        # Generate time slots for each day
-        for day in [Day.SUNDAY, Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY, Day.THURSDAY]:
-            current_time = day_start
-            while current_time.hour + slot_duration <= day_end.hour:
-                # Skip Monday 1-3 PM slot
-                if (
-                    day == Day.MONDAY
-                    and current_time.hour == 13
-                    or (day == Day.MONDAY and current_time.hour == 12)
-                ):
-                    current_time = time(current_time.hour + slot_duration, 0)
-                    continue
-
-                slot_end = time(current_time.hour + slot_duration, 0)
-
-                # Add the time slot
-                availability.append(
-                    TimePreference(day=day, start_time=current_time, end_time=slot_end)
-                )
-
-                # Move to next slot
-                current_time = time(current_time.hour + slot_duration, 0)
-
-        return availability
+    def generate_base_availability() -> Tuple[TimePreference, ...]:
+        return _BASE_SLOTS
 
     @staticmethod
-    def print_availability(availability: List[TimePreference]):
+    def print_availability(availability: List[TimePreference]) -> None:
         # Group time slots by day
         day_slots: Dict[Day, List[TimePreference]] = {}
         for slot in availability:
@@ -80,7 +93,7 @@ class BaseAvailability:
         # Print organized schedule
         print("\nBase Availability Schedule:")
         print("=" * 50)
-        for day in sorted(day_slots.keys(), key=lambda x: x.value):
+        for day in sorted(day_slots):
             print(f"\n{day.name}:")
             print("-" * 20)
             for slot in sorted(day_slots[day], key=lambda x: x.start_time):
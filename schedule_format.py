@@ -1,154 +1,159 @@
 # schedule_format.py
 
 
+import io
 import json
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict
+from datetime import datetime, time
+from functools import lru_cache
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from models.block import Assignment, BlockType
-from models.labs import Lab
+from models.block import Assignment
 from utils.room_utils import get_room_key
 
+_SESSION_SEPARATOR = "\n    " + "-" * 80  # Separator between assignments
 
-def format_schedule(assignments: Dict[str, Assignment]) -> str:
-    """Format schedule into readable output"""
-    # Group assignments by day and time
-    schedule_by_day = defaultdict(lambda: defaultdict(list))
-
-    for block_id, assignment in assignments.items():
-        day = assignment.time_slot.day
-        start_time = assignment.time_slot.start_time
-        schedule_by_day[day][start_time].append(assignment)
-
-    # Format output
-    output = []
-    output.append("=" * 100)
-    output.append("UNIVERSITY SCHEDULE")
-    output.append("=" * 100)
-
-    # Sort days and times
-    for day in sorted(schedule_by_day.keys(), key=lambda x: x.value):
-        output.append(f"\n{day.name}")
-        output.append("-" * 100)
-
-        for start_time in sorted(schedule_by_day[day].keys()):
-            output.append(f"\n{start_time.strftime('%I:%M %p')}:")
-
-            # Sort assignments by type (lectures first, then labs)
-            assignments = sorted(
-                schedule_by_day[day][start_time],
-                key=lambda x: (
-                    x.block.block_type.value,
-                    x.block.course_object.course_code,
-                ),
-            )
-
-            for assignment in assignments:
-                block = assignment.block
-                room = assignment.room
-
-                # Format session type and group info
-                session_type = (
-                    "Lecture" if block.block_type == BlockType.LECTURE else "Lab"
-                )
-                group_info = f"Group {block.group_number}/{block.total_groups}"
-
-                # Format basic info
-                info = [
-                    f"Course: {block.course_object.course_code}",
-                    f"Type: {session_type}",
-                    f"Group: {group_info}",
-                    f"Room: {room.name} (Capacity: {room.capacity})",
-                    f"Staff: {block.staff_member.name}",
-                ]
-
-                output.append("    " + " | ".join(info))
-
-                # Add staff details
-                staff_details = [
-                    f"      Staff Department: {block.staff_member.department.name}",
-                    f"      Academic Degree: {block.staff_member.academic_degree.name}",
-                ]
-                output.extend(staff_details)
-
-                # Add room type for labs
-                if isinstance(room, Lab):
-                    output.append(f"      Lab Type: {room.lab_type.value}")
-
-                output.append("    " + "-" * 80)  # Separator between assignments
-
-    return "\n".join(output)
 
+@lru_cache(maxsize=256)
+def _format_time(value: time, fmt: str) -> str:
+    # A schedule only has a handful of distinct times; format each once
+    return value.strftime(fmt)
 
-def print_schedule_statistics(assignments: Dict[str, Assignment]):
-    """Print statistics about the schedule"""
-    # Initialize counters
-    total_sessions = len(assignments)
+
+def _collect_stats(assignments: Dict[str, Assignment]) -> Tuple[int, int, int, int]:
+    """Count lectures, rooms, staff and courses in a single pass"""
     lectures = 0
-    labs = 0
     rooms_used = set()
     staff_assigned = set()
     courses = set()
 
     for assignment in assignments.values():
-        # Count session types
-        if assignment.block.block_type == BlockType.LECTURE:
+        block = assignment.block
+        if block.is_lecture:
             lectures += 1
-        else:
-            labs += 1
-
-        # Track unique resources
         rooms_used.add(assignment.room.name)
-        staff_assigned.add(assignment.block.staff_member.name)
-        courses.add(assignment.block.course_object.course_code)
-
-    # Print statistics
-    print("\n" + "=" * 50)
-    print("SCHEDULE STATISTICS")
-    print("=" * 50)
-    print(f"Total Sessions: {total_sessions}")
-    print(f"Total Lectures: {lectures}")
-    print(f"Total Labs: {labs}")
-    print(f"Unique Rooms Used: {len(rooms_used)}")
-    print(f"Staff Members Involved: {len(staff_assigned)}")
-    print(f"Courses Scheduled: {len(courses)}")
-    print("=" * 50)
+        staff_assigned.add(block.staff_member.name)
+        courses.add(block.course_code)
+
+    return lectures, len(rooms_used), len(staff_assigned), len(courses)
+
+
+def _schedule_order(assignment: Assignment) -> Tuple[int, Tuple[str, str]]:
+    # slot_id encodes (day, start time), so one sort orders days, then times,
+    # then sessions within a time slot
+    return assignment.time_slot.slot_id, assignment.block._sort_key
+
+
+def _statistics_lines(
+    total_sessions: int, stats: Tuple[int, int, int, int]
+) -> List[str]:
+    lectures, rooms_used, staff_assigned, courses = stats
+    return [
+        "=" * 50,
+        "SCHEDULE STATISTICS",
+        "=" * 50,
+        f"Total Sessions: {total_sessions}",
+        f"Total Lectures: {lectures}",
+        f"Total Labs: {total_sessions - lectures}",
+        f"Unique Rooms Used: {rooms_used}",
+        f"Staff Members Involved: {staff_assigned}",
+        f"Courses Scheduled: {courses}",
+        "=" * 50,
+    ]
+
+
+def format_schedule(
+    assignments: Dict[str, Assignment], out: Optional[TextIO] = None
+) -> Optional[str]:
+    """Format schedule into readable output.
+
+    Writes to out when given (returning None), otherwise returns the text.
+    """
+    if out is not None:
+        _write_schedule(assignments, out)
+        return None
+
+    buffer = io.StringIO()
+    _write_schedule(assignments, buffer)
+    return buffer.getvalue()
+
+
+def _write_schedule(assignments: Dict[str, Assignment], out: TextIO) -> None:
+    # Lines are newline-separated with no trailing newline
+    write = out.write
+    rule = "=" * 100
+    write(f"{rule}\nUNIVERSITY SCHEDULE\n{rule}")
+
+    # A single stable sort replaces per-day/per-time grouping and sorting;
+    # headers are emitted whenever the day or start time changes
+    current_day = None
+    current_start = None
+    for assignment in sorted(assignments.values(), key=_schedule_order):
+        time_slot = assignment.time_slot
+        if time_slot.day is not current_day:
+            current_day = time_slot.day
+            current_start = None
+            write(f"\n\n{current_day.name}\n{'-' * 100}")
+        if time_slot.start_time != current_start:
+            current_start = time_slot.start_time
+            write(f"\n\n{_format_time(current_start, '%I:%M %p')}:")
+
+        write(_render_session(assignment))
+
+
+def _render_session(assignment: Assignment) -> str:
+    block = assignment.block
+    room = assignment.room
+    staff = block.staff_member
+
+    # Format session type and group info
+    session_type = "Lecture" if block.is_lecture else "Lab"
+
+    # Add room type for labs
+    lab_line = f"\n      Lab Type: {room.lab_type.value}" if room.is_lab else ""
+
+    return (
+        f"\n    Course: {block.course_code}"
+        f" | Type: {session_type}"
+        f" | Group: Group {block.group_number}/{block.total_groups}"
+        f" | Room: {room.name} (Capacity: {room.capacity})"
+        f" | Staff: {staff.name}"
+        # Staff details
+        f"\n      Staff Department: {staff.department.name}"
+        f"\n      Academic Degree: {staff.academic_degree.name}"
+        f"{lab_line}{_SESSION_SEPARATOR}"
+    )
+
+
+def print_schedule_statistics(assignments: Dict[str, Assignment]):
+    """Print statistics about the schedule"""
+    stats = _collect_stats(assignments)
+
+    print()
+    for line in _statistics_lines(len(assignments), stats):
+        print(line)
 
 
 def generate_schedule_report(
     assignments: Dict[str, Assignment], output_file: str = "schedule_report.txt"
 ):
     """Generate a complete schedule report"""
-    with open(output_file, "w", encoding="utf-8") as f:
-        # Write formatted schedule
-        f.write(format_schedule(assignments))
+    _write_schedule_report(assignments, _collect_stats(assignments), output_file)
 
-        # Add statistics
-        f.write("\n\n")
 
-        # Collect statistics
-        total_sessions = len(assignments)
-        lectures = sum(
-            1 for a in assignments.values() if a.block.block_type == BlockType.LECTURE
-        )
-        labs = total_sessions - lectures
-
-        rooms_used = len({a.room.name for a in assignments.values()})
-        staff_assigned = len({a.block.staff_member.name for a in assignments.values()})
-        courses = len({a.block.course_object.course_code for a in assignments.values()})
-
-        # Write statistics
-        f.write("=" * 50 + "\n")
-        f.write("SCHEDULE STATISTICS\n")
-        f.write("=" * 50 + "\n")
-        f.write(f"Total Sessions: {total_sessions}\n")
-        f.write(f"Total Lectures: {lectures}\n")
-        f.write(f"Total Labs: {labs}\n")
-        f.write(f"Unique Rooms Used: {rooms_used}\n")
-        f.write(f"Staff Members Involved: {staff_assigned}\n")
-        f.write(f"Courses Scheduled: {courses}\n")
-        f.write("=" * 50 + "\n")
+def _write_schedule_report(
+    assignments: Dict[str, Assignment],
+    stats: Tuple[int, int, int, int],
+    output_file: str,
+) -> None:
+    # Assemble in memory and hit the file once
+    buffer = io.StringIO()
+    _write_schedule(assignments, buffer)
+    buffer.write("\n\n")
+    buffer.write("\n".join(_statistics_lines(len(assignments), stats)))
+    buffer.write("\n")
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
 
     print(f"Schedule report generated: {output_file}")
 
@@ -157,87 +162,133 @@ def generate_schedule_json(
     assignments: Dict[str, Assignment], output_file: str = "schedule.json"
 ):
     """Generate a JSON representation of the schedule"""
-    # Convert the schedule to a serializable format
+    output, _ = _build_schedule_json(assignments)
+    _write_schedule_json(output, output_file)
+    return output
+
+
+def generate_schedule_files(
+    assignments: Dict[str, Assignment],
+    json_file: str = "schedule.json",
+    report_file: str = "schedule_report.txt",
+):
+    """Generate the JSON schedule and the text report together.
+
+    Equivalent to generate_schedule_json followed by generate_schedule_report,
+    but the statistics are counted during the JSON pass instead of in a
+    second traversal. Returns the JSON output.
+    """
+    output, stats = _build_schedule_json(assignments)
+    _write_schedule_json(output, json_file)
+    _write_schedule_report(assignments, stats, report_file)
+    return output
+
+
+def _write_schedule_json(output: Dict, output_file: str) -> None:
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+    print(f"Schedule JSON file generated: {output_file}")
+
+
+def _build_schedule_json(
+    assignments: Dict[str, Assignment],
+) -> Tuple[Dict, Tuple[int, int, int, int]]:
+    """Serialize the schedule and count its report statistics in one pass"""
     serialized_schedule = []
+    lectures = 0
+    room_names = set()
+    room_keys = set()
+    staff_names = set()
+    courses = set()
 
-    for block_id, assignment in assignments.items():
+    # Sort by day and start time for consistency; the sort is stable, so
+    # sessions sharing a slot keep their scheduling order
+    for block_id, assignment in sorted(
+        assignments.items(), key=lambda item: item[1].time_slot.slot_id
+    ):
         block = assignment.block
         room = assignment.room
-        time_slot = assignment.time_slot
+        room_key = get_room_key(room)
 
-        # Use composite key for room identification
-        room_type, room_id = get_room_key(room)
-        lab_type = room.lab_type.value if room_type == "lab" else None
-
-        # Create serializable object for this assignment
-        serialized_assignment = {
-            "block_id": block_id,
-            "course_code": block.course_object.course_code,
-            "session_type": block.block_type.value,
-            "group_info": {
-                "group_number": block.group_number,
-                "total_groups": block.total_groups,
-            },
-            "room": {
-                "composite_id": f"{room_type}_{room_id}",  # Add composite identifier
-                "id": room_id,
-                "name": room.name,
-                "capacity": room.capacity,
-                "type": room_type,
-            },
-            "staff": {
-                "id": block.staff_member.id,
-                "name": block.staff_member.name,
-                "department": block.staff_member.department.name,
-                "academic_degree": block.staff_member.academic_degree.name,
-                "is_permanent": block.staff_member.is_permanent,
-            },
-            "time_slot": {
-                "day": time_slot.day.name,
-                "day_index": time_slot.day.value,
-                "start_time": time_slot.start_time.strftime("%H:%M"),
-                "end_time": time_slot.end_time.strftime("%H:%M"),
-            },
-            "student_count": block.student_count,
-            "academic_list": block.academic_list,
-            "academic_level": block.academic_level,
-        }
-
-        # Add lab-specific info if applicable
-        if room_type == "lab":
-            serialized_assignment["room"]["lab_type"] = lab_type
-            serialized_assignment["room"][
-                "used_in_non_specialist_courses"
-            ] = room.used_in_non_specialist_courses
-
-        serialized_schedule.append(serialized_assignment)
-
-    # Sort by day and start time for consistency
-    serialized_schedule.sort(
-        key=lambda x: (x["time_slot"]["day_index"], x["time_slot"]["start_time"])
-    )
+        if block.is_lecture:
+            lectures += 1
+        room_names.add(room.name)
+        room_keys.add(room_key)
+        staff_names.add(block.staff_member.name)
+        courses.add(block.course_code)
+
+        serialized_schedule.append(
+            _serialize_assignment(block_id, assignment, room_key)
+        )
 
     # Create metadata with composite key stats
-    room_keys = set(
-        get_room_key(assignment.room) for assignment in assignments.values()
-    )
     metadata = {
         "total_sessions": len(assignments),
-        "total_courses": len(set(a["course_code"] for a in serialized_schedule)),
+        "total_courses": len(courses),
         "total_rooms": len(room_keys),  # Use composite keys for accurate count
-        "total_staff": len(set(a["staff"]["name"] for a in serialized_schedule)),
+        "total_staff": len(staff_names),
         "generation_timestamp": datetime.now().isoformat(),
     }
 
     # Create final output object
     output = {"metadata": metadata, "schedule": serialized_schedule}
+    stats = (lectures, len(room_names), len(staff_names), len(courses))
+    return output, stats
+
+
+def _serialize_assignment(
+    block_id: str, assignment: Assignment, room_key: Tuple[str, int]
+) -> Dict:
+    block = assignment.block
+    room = assignment.room
+    time_slot = assignment.time_slot
+    staff = block.staff_member
+    day = time_slot.day
+    room_type, room_id = room_key
+
+    # Create serializable object for this assignment
+    serialized_assignment = {
+        "block_id": block_id,
+        "course_code": block.course_code,
+        "session_type": block.block_type.value,
+        "group_info": {
+            "group_number": block.group_number,
+            "total_groups": block.total_groups,
+        },
+        "room": {
+            "composite_id": f"{room_type}_{room_id}",  # Add composite identifier
+            "id": room_id,
+            "name": room.name,
+            "capacity": room.capacity,
+            "type": room_type,
+        },
+        "staff": {
+            "id": staff.id,
+            "name": staff.name,
+            "department": staff.department.name,
+            "academic_degree": staff.academic_degree.name,
+            "is_permanent": staff.is_permanent,
+        },
+        "time_slot": {
+            "day": day.name,
+            "day_index": day.value,
+            "start_time": _format_time(time_slot.start_time, "%H:%M"),
+            "end_time": _format_time(time_slot.end_time, "%H:%M"),
+        },
+        "student_count": block.student_count,
+        "academic_list": block.academic_list,
+        "academic_level": block.academic_level,
+    }
 
-    # Write to file
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    # Add lab-specific info if applicable
+    if room_type == "lab":
+        serialized_assignment["room"]["lab_type"] = room.lab_type.value
+        serialized_assignment["room"][
+            "used_in_non_specialist_courses"
+        ] = room.used_in_non_specialist_courses
 
-    print(f"Schedule JSON file generated: {output_file}")
-    return output
+    return serialized_assignment
 
 
 # Usage example:
@@ -247,4 +298,5 @@ if __name__ == "__main__":
     # print_schedule_statistics(assignments))
     # generate_schedule_report(assignments)
     # generate_schedule_json(assignments)
+    # generate_schedule_files(assignments)
     pass
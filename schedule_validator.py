@@ -1,15 +1,19 @@
 # schedule_validator.py
 
 
+import atexit
 import logging
+import time
+from bisect import bisect_right
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 from typing import Dict, List, Tuple
 
 from models.block import Assignment, Block
-from models.labs import Lab
 from models.study_plan import CourseAssignment, StudyPlan
 from utils.room_utils import get_room_key
 
@@ -20,15 +24,16 @@ class ValidationLevel(Enum):
     INFO = "INFO"
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationMessage:
     level: ValidationLevel
     message: str
     context: dict
-    timestamp: datetime = datetime.now()
+    # Epoch nanoseconds, taken per message; formatted only for summaries
+    timestamp: int = field(default_factory=time.time_ns)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConflictReport:
     conflict_type: str
     description: str
@@ -40,12 +45,18 @@ class ScheduleValidator:
     def __init__(self):
         self.logger = self._setup_logger()
         self.validation_messages: List[ValidationMessage] = []
+        # room key -> {day: (sorted window starts, running max of window ends)}
+        self._room_avail_idx: Dict[Tuple, Dict] = {}
 
     def _setup_logger(self):
         """Configure logging system"""
         logger = logging.getLogger("scheduler")
         logger.setLevel(logging.DEBUG)
 
+        # Handlers are attached once per process, not once per validator
+        if any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+            return logger
+
         # File handler for detailed logging
         fh = logging.FileHandler("scheduler.log")
         fh.setLevel(logging.DEBUG)
@@ -61,8 +72,13 @@ class ScheduleValidator:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
 
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        # Callers only enqueue records; a background thread does the I/O
+        log_queue = Queue(-1)
+        listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger.addHandler(QueueHandler(log_queue))
 
         return logger
 
@@ -108,14 +124,14 @@ class ScheduleValidator:
                 {"course": course.course_code, "groups": course.lecture_groups},
             )
 
-        if course.lab_groups and course.lab_groups < 1:
+        if course.lab_groups < 0:
             self._add_error(
                 "Invalid lab groups count",
                 {"course": course.course_code, "groups": course.lab_groups},
             )
 
         # Validate lecturer assignments
-        total_lecturer_groups = sum(la["num_of_groups"] for la in course.lecturers)
+        total_lecturer_groups = sum(course.lecturer_group_counts)
         if total_lecturer_groups != course.lecture_groups:
             self._add_error(
                 "Mismatch in lecturer group assignments",
@@ -134,9 +150,7 @@ class ScheduleValidator:
                     {"course": course.course_code},
                 )
             else:
-                total_ta_groups = sum(
-                    ta["num_of_groups"] for ta in course.teaching_assistants
-                )
+                total_ta_groups = sum(course.ta_group_counts)
                 if total_ta_groups != course.lab_groups:
                     self._add_error(
                         "Mismatch in TA group assignments",
@@ -176,7 +190,7 @@ class ScheduleValidator:
         for block_id, assignment in assignments.items():
             # Validate room type
             if assignment.block.required_room_type == "lab":
-                if not isinstance(assignment.room, Lab):
+                if not assignment.room.is_lab:
                     self._add_error(
                         "Invalid room type assignment",
                         {
@@ -207,15 +221,16 @@ class ScheduleValidator:
     def _validate_time_slot(self, assignment: Assignment):
         """Validate time slot assignment"""
         # Check if time slot is within room availability
-        slot_valid = False
-        for available in assignment.room.availability:
-            if (
-                available.day == assignment.time_slot.day
-                and available.start_time <= assignment.time_slot.start_time
-                and available.end_time >= assignment.time_slot.end_time
-            ):
-                slot_valid = True
-                break
+        slot = assignment.time_slot
+        room = assignment.room
+        slot_valid = (slot.day, slot.start_time, slot.end_time) in room._available_slots
+        if not slot_valid:
+            # Some window starting at or before the slot must end after it
+            windows = self._room_availability_index(room).get(slot.day)
+            if windows:
+                starts, max_ends = windows
+                i = bisect_right(starts, slot.start_time) - 1
+                slot_valid = i >= 0 and max_ends[i] >= slot.end_time
 
         if not slot_valid:
             room_type, room_id = get_room_key(assignment.room)
@@ -229,26 +244,46 @@ class ScheduleValidator:
                 },
             )
 
+    def _room_availability_index(self, room) -> Dict:
+        """Per-day availability windows for a room, built on first use"""
+        room_key = get_room_key(room)
+        index = self._room_avail_idx.get(room_key)
+        if index is None:
+            by_day = defaultdict(list)
+            for available in room.availability:
+                by_day[available.day].append((available.start_time, available.end_time))
+
+            index = {}
+            for day, windows in by_day.items():
+                windows.sort()
+                max_ends = []
+                for _, end_time in windows:
+                    if max_ends and max_ends[-1] > end_time:
+                        end_time = max_ends[-1]
+                    max_ends.append(end_time)
+                index[day] = ([start for start, _ in windows], max_ends)
+            self._room_avail_idx[room_key] = index
+        return index
+
     def _check_resource_conflicts(self, assignments: Dict[str, Assignment]):
         """Check for conflicts in resource usage"""
-        # Track room usage with composite keys
-        room_usage = {}  # (room_type, room_id, day, time) -> block_id
-
-        # Track staff usage
-        staff_usage = {}  # (staff_id, day, time) -> block_id
+        # Bucket (start, end, block_id) intervals per resource and day, so
+        # partial overlaps are caught as well as identical start times
+        room_usage = defaultdict(list)  # (room_type, room_id, day) -> intervals
+        staff_usage = defaultdict(list)  # (staff_id, day) -> intervals
 
         for block_id, assignment in assignments.items():
-            # Check room conflicts with composite key
-            room_key = get_room_key(assignment.room)
-            room_time_key = (
-                room_key[0],  # room_type
-                room_key[1],  # room_id
-                assignment.time_slot.day,
-                assignment.time_slot.start_time,
+            time_slot = assignment.time_slot
+            interval = (time_slot.start_time, time_slot.end_time, block_id)
+            room_type, room_id = get_room_key(assignment.room)
+            room_usage[(room_type, room_id, time_slot.day)].append(interval)
+            staff_usage[(assignment.block.staff_member.id, time_slot.day)].append(
+                interval
             )
 
-            if room_time_key in room_usage:
-                room_type, room_id = room_key
+        for (room_type, room_id, _), intervals in room_usage.items():
+            for block_id, other_id in self._overlapping_intervals(intervals):
+                assignment = assignments[block_id]
                 self._add_error(
                     "Room double booking detected",
                     {
@@ -257,28 +292,38 @@ class ScheduleValidator:
                         "room_id": room_id,
                         "time": str(assignment.time_slot),
                         "block1": block_id,
-                        "block2": room_usage[room_time_key],
+                        "block2": other_id,
                     },
                 )
-            room_usage[room_time_key] = block_id
 
-            # Check staff conflicts (unchanged logic)
-            staff_key = (
-                assignment.block.staff_member.id,
-                assignment.time_slot.day,
-                assignment.time_slot.start_time,
-            )
-            if staff_key in staff_usage:
+        for intervals in staff_usage.values():
+            for block_id, other_id in self._overlapping_intervals(intervals):
+                assignment = assignments[block_id]
                 self._add_error(
                     "Staff double booking detected",
                     {
                         "staff": assignment.block.staff_member.name,
                         "time": str(assignment.time_slot),
                         "block1": block_id,
-                        "block2": staff_usage[staff_key],
+                        "block2": other_id,
                     },
                 )
-            staff_usage[staff_key] = block_id
+
+    @staticmethod
+    def _overlapping_intervals(intervals: List[Tuple]) -> List[Tuple[str, str]]:
+        """Sweep sorted intervals, pairing each one with an earlier overlap"""
+        if len(intervals) < 2:
+            return []
+
+        overlaps = []
+        intervals.sort()
+        _, latest_end, latest_id = intervals[0]
+        for start, end, block_id in intervals[1:]:
+            if start < latest_end:
+                overlaps.append((block_id, latest_id))
+            if end > latest_end:
+                latest_end, latest_id = end, block_id
+        return overlaps
 
     def validate_schedule_comprehensive(
         self, assignments: Dict[str, Assignment]
@@ -522,8 +567,7 @@ class ScheduleValidator:
             print("✅ No conflicts found - schedule is valid!")
             return
 
-        print(f"❌ Found {len(conflicts)} conflicts:")
-        print("=" * 60)
+        lines = [f"❌ Found {len(conflicts)} conflicts:", "=" * 60]
 
         # Group conflicts by type
         by_type = defaultdict(list)
@@ -531,20 +575,25 @@ class ScheduleValidator:
             by_type[conflict.conflict_type].append(conflict)
 
         for conflict_type, type_conflicts in by_type.items():
-            print(f"\n{conflict_type} ({len(type_conflicts)} conflicts):")
-            print("-" * 40)
+            lines.append(f"\n{conflict_type} ({len(type_conflicts)} conflicts):")
+            lines.append("-" * 40)
 
             for i, conflict in enumerate(type_conflicts, 1):
-                print(f"{i}. {conflict.description}")
-                if conflict.details.get("conflicting_courses"):
-                    courses = ", ".join(conflict.details["conflicting_courses"])
-                    print(f"   Courses: {courses}")
-                if conflict.details.get("staff_name"):
-                    print(f"   Staff: {conflict.details['staff_name']}")
-                if conflict.details.get("room_name"):
-                    print(f"   Room: {conflict.details['room_name']}")
-                print(f"   Affected assignments: {len(conflict.affected_assignments)}")
-                print()
+                details = conflict.details
+                lines.append(f"{i}. {conflict.description}")
+                if details.get("conflicting_courses"):
+                    courses = ", ".join(details["conflicting_courses"])
+                    lines.append(f"   Courses: {courses}")
+                if details.get("staff_name"):
+                    lines.append(f"   Staff: {details['staff_name']}")
+                if details.get("room_name"):
+                    lines.append(f"   Room: {details['room_name']}")
+                lines.append(
+                    f"   Affected assignments: {len(conflict.affected_assignments)}"
+                )
+                lines.append("")
+
+        print("\n".join(lines))
 
     def _add_error(self, message: str, context: dict):
         """Add error level validation message"""
@@ -569,32 +618,24 @@ class ScheduleValidator:
 
     def get_validation_summary(self) -> Dict:
         """Generate summary of validation results"""
-        return {
-            "total_messages": len(self.validation_messages),
-            "errors": len(
-                [
-                    m
-                    for m in self.validation_messages
-                    if m.level == ValidationLevel.ERROR
-                ]
-            ),
-            "warnings": len(
-                [
-                    m
-                    for m in self.validation_messages
-                    if m.level == ValidationLevel.WARNING
-                ]
-            ),
-            "info": len(
-                [m for m in self.validation_messages if m.level == ValidationLevel.INFO]
-            ),
-            "messages": [
+        # Count levels and serialize messages in a single pass
+        counts = dict.fromkeys(ValidationLevel, 0)
+        messages = []
+        for m in self.validation_messages:
+            counts[m.level] += 1
+            messages.append(
                 {
                     "level": m.level.value,
                     "message": m.message,
                     "context": m.context,
-                    "timestamp": m.timestamp.isoformat(),
+                    "timestamp": datetime.fromtimestamp(m.timestamp / 1e9).isoformat(),
                 }
-                for m in self.validation_messages
-            ],
+            )
+
+        return {
+            "total_messages": len(self.validation_messages),
+            "errors": counts[ValidationLevel.ERROR],
+            "warnings": counts[ValidationLevel.WARNING],
+            "info": counts[ValidationLevel.INFO],
+            "messages": messages,
         }
@@ -1,19 +1,25 @@
 # scheduler.py - Enhanced with comprehensive logging
 
+import hashlib
+import json
 import logging
-from copy import deepcopy
+import os
+import sys
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime, time
 from enum import Enum
+from itertools import chain
 from typing import Callable, Dict, List, Optional, Set, Union
 
+from managers.constraint_manager import LAB_REQUIREMENTS, SINGLE_GROUP_CONFLICT
 from models.block import Assignment, Block, BlockType
 from models.halls import Hall
 from models.labs import Lab
 from models.scheduling_attempt import SchedulingAttempt
 from models.staff_members import Lecturer, TeachingAssistant
 from models.study_plan import CourseAssignment, StudyPlan
-from models.time_preferences import TimePreference
+from models.time_preferences import Day, TimePreference
 from schedule_format import (
     generate_schedule_json,
     generate_schedule_report,
@@ -21,12 +27,29 @@ from schedule_format import (
 )
 from utils.room_utils import get_room_key
 
+# Hard constraint failures that hold for a slot in every room
+_ROOM_INDEPENDENT_VIOLATIONS = frozenset((SINGLE_GROUP_CONFLICT,))
+# Hard constraint failures that hold for a room in every slot
+_SLOT_INDEPENDENT_VIOLATIONS = frozenset((LAB_REQUIREMENTS,))
+
+# Bump when the cached schedule layout or the fingerprint inputs change
+_SCHEDULE_CACHE_VERSION = 1
+
 
 class SchedulingEngine:
-    def __init__(self, constraint_manager, resource_manager):
+    def __init__(
+        self, constraint_manager, resource_manager, cache_dir: Optional[str] = None
+    ):
         self.constraint_manager = constraint_manager
         self.resource_manager = resource_manager
+        # Directory for schedules keyed by an input fingerprint; None disables
+        self.cache_dir = cache_dir
         self.logger = logging.getLogger("scheduler")
+        # (block_id, room_key) -> slots allowed by room and staff preferences;
+        # bookings are masked out at lookup, so entries stay valid for a run
+        self._slots_cache = {}
+        # block_id -> suitable rooms; rooms and blocks are fixed within a run
+        self._rooms_cache = {}
 
     def schedule_blocks(
         self,
@@ -43,9 +66,30 @@ class SchedulingEngine:
             course_assignments, study_plan_mapping
         )
         total_blocks = len(blocks)
+        self._rooms_cache.clear()
+        self._slots_cache.clear()
+
+        # Priority inputs never change while scheduling; score each block once
+        priorities = {
+            block.id: self._calculate_block_priority(block) for block in blocks
+        }
 
         self.logger.info(f"Converted to {total_blocks} blocks total")
 
+        cache_path = self._schedule_cache_path(blocks, max_attempts)
+        if cache_path:
+            cached_assignments = self._load_cached_schedule(cache_path, blocks)
+            if cached_assignments is not None:
+                self.logger.info(
+                    f"Reusing cached schedule: {len(cached_assignments)}/{total_blocks} blocks"
+                )
+                self._verify_final_schedule(cached_assignments)
+                if progress_callback:
+                    progress_callback(
+                        len(cached_assignments), total_blocks, "completed", 1
+                    )
+                return cached_assignments
+
         best_assignments = {}
         best_score = 0.0
         best_count = 0
@@ -53,6 +97,11 @@ class SchedulingEngine:
         if progress_callback:
             progress_callback(0, total_blocks, "initializing", 1)
 
+        # Every attempt sorts against an empty state, so the priority order
+        # is the same each time; compute it once up front
+        self.constraint_manager.initialize_fresh_state()
+        sorted_blocks = self._sort_blocks_by_priority(blocks, priorities)
+
         for attempt in range(max_attempts):
             self.logger.info(
                 f"\n=== SCHEDULING ATTEMPT {attempt + 1}/{max_attempts} ==="
@@ -62,9 +111,6 @@ class SchedulingEngine:
             self.constraint_manager.initialize_fresh_state()
             scheduled_count = 0
 
-            # Sort blocks by priority (uses current empty state)
-            sorted_blocks = self._sort_blocks_by_priority(blocks)
-
             # Schedule each block one by one
             for i, block in enumerate(sorted_blocks):
                 self.logger.info(
@@ -130,20 +176,182 @@ class SchedulingEngine:
         # FINAL VERIFICATION
         self._verify_final_schedule(best_assignments)
 
+        if cache_path:
+            self._store_cached_schedule(cache_path, best_assignments)
+
         return best_assignments
 
+    def _schedule_cache_path(
+        self, blocks: List[Block], max_attempts: int
+    ) -> Optional[str]:
+        """Cache file for these inputs, or None when caching does not apply"""
+        if self.cache_dir is None:
+            return None
+        # Registered constraints are arbitrary callables and can't be fingerprinted
+        if self.constraint_manager.has_extra_constraints():
+            return None
+
+        rooms = sorted(
+            chain(
+                self.resource_manager.halls.values(),
+                self.resource_manager.labs.values(),
+            ),
+            key=get_room_key,
+        )
+        fingerprint = (
+            _SCHEDULE_CACHE_VERSION,
+            max_attempts,
+            self.resource_manager.time_slot_duration,
+            tuple(
+                (
+                    get_room_key(room),
+                    room.capacity,
+                    (
+                        (room.lab_type.value, room.used_in_non_specialist_courses)
+                        if room.is_lab
+                        else None
+                    ),
+                    tuple((slot.slot_id, slot.slot_mask) for slot in room.availability),
+                )
+                for room in rooms
+            ),
+            tuple(
+                (
+                    block.id,
+                    block.block_type.value,
+                    block.staff_member.id,
+                    int(block.staff_member.staff_kind),
+                    tuple(
+                        (slot.slot_id, slot.slot_mask)
+                        for slot in block.staff_member.timing_preferences
+                    ),
+                    block.student_count,
+                    block.required_room_type,
+                    block.group_number,
+                    block.total_groups,
+                    block.is_single_group_course,
+                    block.academic_list,
+                    block.academic_level,
+                    block.practical_in_lab,
+                    tuple(map(get_room_key, block.preferred_rooms or ())),
+                )
+                for block in blocks
+            ),
+        )
+        # repr of nested tuples of plain values is stable across runs, unlike
+        # pickle whose memo depends on object identity
+        key = hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached_schedule(
+        self, cache_path: str, blocks: List[Block]
+    ) -> Optional[Dict[str, Assignment]]:
+        """Replay a cached schedule through the constraint manager.
+
+        Returns None on a miss, or if any cached placement no longer passes
+        the hard constraints, leaving a fresh state for a normal solve.
+        """
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                placements = json.load(f)["placements"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        blocks_by_id = {block.id: block for block in blocks}
+        rooms_by_key = {
+            get_room_key(room): room
+            for room in chain(
+                self.resource_manager.halls.values(),
+                self.resource_manager.labs.values(),
+            )
+        }
+
+        self.constraint_manager.initialize_fresh_state()
+        for block_id, (day, start, end, room_type, room_id) in placements.items():
+            block = blocks_by_id.get(block_id)
+            room = rooms_by_key.get((room_type, room_id))
+            if block is None or room is None:
+                break
+            slot = TimePreference(
+                Day(day), time.fromisoformat(start), time.fromisoformat(end)
+            )
+            is_valid, _ = self.constraint_manager.can_assign(block, slot, room)
+            if not is_valid or not self.constraint_manager.make_assignment(
+                block_id, Assignment(block, slot, room)
+            ):
+                break
+        else:
+            return self.constraint_manager.get_all_assignments()
+
+        self.logger.warning(f"Ignoring stale schedule cache {cache_path}")
+        self.constraint_manager.initialize_fresh_state()
+        return None
+
+    def _store_cached_schedule(
+        self, cache_path: str, assignments: Dict[str, Assignment]
+    ) -> None:
+        """Write the schedule's placements to cache_path atomically"""
+        placements = {
+            block_id: (
+                int(assignment.time_slot.day),
+                assignment.time_slot.start_time.isoformat(),
+                assignment.time_slot.end_time.isoformat(),
+                *get_room_key(assignment.room),
+            )
+            for block_id, assignment in assignments.items()
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write beside the target and rename, so readers never see a
+            # partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"placements": placements}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write schedule cache: {e}")
+
     def _schedule_single_block(self, block: Block) -> Optional[Assignment]:
-        possible_rooms = self.resource_manager.get_suitable_rooms(block)
+        possible_rooms = self._get_possible_rooms(block)
+        state = self.constraint_manager.state
+        iter_can_assign = self.constraint_manager.iter_can_assign
+        staff_busy = state.staff_busy.get(block.staff_member.id, 0)
+        # Slot ids ruled out for this block whatever the room; room-independent
+        # checks compare exact starts, so only those starts are skipped later
+        rejected = set()
         for room in possible_rooms:
-            available_slots = self.resource_manager.get_available_slots(
-                block, room, self.constraint_manager.get_all_assignments()
-            )
-            for slot in available_slots:
-                is_valid, _ = self.constraint_manager.can_assign(block, slot, room)
+            # One AND rules out slots the staff member or room already covers
+            busy = staff_busy | state.room_busy.get(get_room_key(room), 0)
+            candidates = [
+                slot
+                for slot in self._get_available_slots(block, room)
+                if not busy & slot.slot_mask and slot.slot_id not in rejected
+            ]
+            for slot, is_valid, violation in iter_can_assign(block, candidates, room):
                 if is_valid:
                     return Assignment(block, slot, room)
+                if violation in _ROOM_INDEPENDENT_VIOLATIONS:
+                    rejected.add(slot.slot_id)
+                elif violation in _SLOT_INDEPENDENT_VIOLATIONS:
+                    # The room itself is unusable for this block; try the next
+                    break
         return None
 
+    def _get_available_slots(
+        self, block: Block, room: Union[Hall, Lab]
+    ) -> List[TimePreference]:
+        """Slots for block in room allowed by the static room and staff data.
+
+        Computed once per run against no bookings; callers mask out slots the
+        room or staff member is already booked in via the state's busy masks.
+        """
+        key = (block.id, get_room_key(room))
+        slots = self._slots_cache.get(key)
+        if slots is None:
+            slots = self.resource_manager.get_available_slots(block, room, {})
+            self._slots_cache[key] = slots
+        return slots
+
     def _verify_no_conflicts_in_assignments(self, assignments):
         # Group by time slot
         by_time = {}
@@ -179,28 +387,22 @@ class SchedulingEngine:
 
         return True
 
-    def _sort_blocks_by_priority(self, blocks: List[Block]) -> List[Block]:
+    def _sort_blocks_by_priority(
+        self, blocks: List[Block], priorities: Dict[str, float]
+    ) -> List[Block]:
         """Sort blocks by various constraints and priorities"""
         self.logger.debug("Sorting blocks by priority...")
 
         def get_block_score(block: Block) -> tuple:
-            # Get current state for accurate calculations
-            current_assignments = self.constraint_manager.get_all_assignments()
-
             # Get possible rooms for this block
-            possible_rooms = self.resource_manager.get_suitable_rooms(block)
+            possible_rooms = self._get_possible_rooms(block)
 
             # Calculate total available time slots across all possible rooms
             total_available_slots = 0
             for room in possible_rooms:
-                available_slots = self.resource_manager.get_available_slots(
-                    block, room, current_assignments
-                )
+                available_slots = self._get_available_slots(block, room)
                 total_available_slots += len(available_slots)
 
-            # Calculate priority score
-            priority_score = self._calculate_block_priority(block)
-
             return (
                 # First priority: Single group courses
                 block.is_single_group_course,
@@ -209,7 +411,7 @@ class SchedulingEngine:
                 # Third priority: Fewer time slot options means more constrained
                 -total_available_slots,
                 # Fourth priority: Calculated priority score
-                priority_score,
+                priorities[block.id],
             )
 
         sorted_blocks = sorted(blocks, key=get_block_score, reverse=True)
@@ -285,27 +487,43 @@ class SchedulingEngine:
         study_plan_mapping: Dict[int, StudyPlan],
     ) -> List[Block]:
         """Convert CourseAssignment objects to Block objects"""
+        # Per-course/per-block tracing is only formatted when INFO is enabled
+        log_info = self.logger.isEnabledFor(logging.INFO)
+
         self.logger.info("=== CONVERTING COURSE ASSIGNMENTS TO BLOCKS ===")
         self.logger.info(f"Course Assignments Count: {len(course_assignments)}")
 
         blocks = []
+        LECTURE = BlockType.LECTURE
+        LAB = BlockType.LAB
 
         for i, course in enumerate(course_assignments):
             # Get the correct study plan for this course
             study_plan = study_plan_mapping[i]
 
-            self.logger.info(f"\n--- COURSE {i+1}: {course.course_code} ---")
-            self.logger.info(
-                f"Study Plan: {study_plan.academic_list.name} Level {study_plan.academic_level}"
-            )
-            self.logger.info(f"Expected Students: {study_plan.expected_students}")
-            self.logger.info(f"Lecture Groups: {course.lecture_groups}")
-            self.logger.info(f"Lab Groups: {course.lab_groups}")
+            # Per-plan fields shared by every block of this course
+            expected_students = study_plan.expected_students
+            academic_list = study_plan.academic_list
+            academic_list_name = academic_list.name
+            academic_level = study_plan.academic_level
+
+            if log_info:
+                self.logger.info(f"\n--- COURSE {i+1}: {course.course_code} ---")
+                self.logger.info(
+                    f"Study Plan: {study_plan.academic_list.name} Level {study_plan.academic_level}"
+                )
+                self.logger.info(f"Expected Students: {study_plan.expected_students}")
+                self.logger.info(f"Lecture Groups: {course.lecture_groups}")
+                self.logger.info(f"Lab Groups: {course.lab_groups}")
 
-            # Generate lecture blocks
-            self.logger.info(f"\n  GENERATING LECTURE BLOCKS for {course.course_code}:")
+                # Generate lecture blocks
+                self.logger.info(
+                    f"\n  GENERATING LECTURE BLOCKS for {course.course_code}:"
+                )
             lecture_group_count = 1
             lecture_blocks_created = 0
+            lecture_students = expected_students // course.lecture_groups
+            lecture_single_group = course.lecture_groups == 1
 
             for lecturer_assignment in course.lecturers:
                 try:
@@ -318,41 +536,45 @@ class SchedulingEngine:
                     lecturer = lecturer_assignment["lecturer"]
                     num_groups = lecturer_assignment["num_of_groups"]
 
-                    self.logger.info(
-                        f"    Creating {num_groups} lecture blocks for {lecturer.name}"
-                    )
+                    if log_info:
+                        self.logger.info(
+                            f"    Creating {num_groups} lecture blocks for {lecturer.name}"
+                        )
 
                     for group_idx in range(num_groups):
-                        block_id = f"L_{course.course_code}_{lecturer.id}_{lecture_group_count}"
+                        # Interned: ids key every assignment and booking dict
+                        block_id = sys.intern(
+                            f"L_{course.course_code}_{lecturer.id}_{lecture_group_count}"
+                        )
 
                         lecture_block = Block(
                             id=block_id,
                             course_code=course.course_code,
                             course_object=course,
-                            block_type=BlockType.LECTURE,
+                            block_type=LECTURE,
                             staff_member=lecturer,
-                            student_count=study_plan.expected_students
-                            // course.lecture_groups,  # Use correct study plan
+                            student_count=lecture_students,
                             required_room_type="hall",
                             group_number=lecture_group_count,
                             total_groups=course.lecture_groups,
-                            is_single_group_course=course.lecture_groups == 1,
-                            academic_list=study_plan.academic_list.name,  # Use correct study plan
-                            academic_list_object=study_plan.academic_list,
-                            academic_level=study_plan.academic_level,  # Use correct study plan
+                            is_single_group_course=lecture_single_group,
+                            academic_list=academic_list_name,
+                            academic_list_object=academic_list,
+                            academic_level=academic_level,
                         )
 
                         blocks.append(lecture_block)
                         lecture_blocks_created += 1
 
-                        self.logger.info(f"    CREATED LECTURE BLOCK: {block_id}")
-                        self.logger.info(
-                            f"      Study Plan: {study_plan.academic_list.name} L{study_plan.academic_level}"
-                        )
-                        self.logger.info(f"      Staff: {lecturer.name}")
-                        self.logger.info(
-                            f"      Students: {lecture_block.student_count}"
-                        )
+                        if log_info:
+                            self.logger.info(f"    CREATED LECTURE BLOCK: {block_id}")
+                            self.logger.info(
+                                f"      Study Plan: {study_plan.academic_list.name} L{study_plan.academic_level}"
+                            )
+                            self.logger.info(f"      Staff: {lecturer.name}")
+                            self.logger.info(
+                                f"      Students: {lecture_block.student_count}"
+                            )
 
                         lecture_group_count += 1
 
@@ -362,7 +584,7 @@ class SchedulingEngine:
                     )
 
             # Generate lab blocks if they exist
-            if course.lab_groups and course.lab_groups > 0:
+            if course.lab_groups > 0:
                 self.logger.info(f"\n  GENERATING LAB BLOCKS for {course.course_code}:")
 
                 if not course.teaching_assistants:
@@ -373,6 +595,9 @@ class SchedulingEngine:
 
                 lab_group_count = 1
                 lab_blocks_created = 0
+                lab_students = expected_students // course.lab_groups
+                lab_single_group = course.lab_groups == 1
+                lab_room_type = "lab" if course.practical_in_lab else "hall"
 
                 for ta_assignment in course.teaching_assistants:
                     try:
@@ -391,7 +616,7 @@ class SchedulingEngine:
                         num_groups = ta_assignment["num_of_groups"]
 
                         for group_idx in range(num_groups):
-                            block_id = (
+                            block_id = sys.intern(
                                 f"P_{course.course_code}_{ta.id}_{lab_group_count}"
                             )
 
@@ -399,31 +624,29 @@ class SchedulingEngine:
                                 id=block_id,
                                 course_code=course.course_code,
                                 course_object=course,
-                                block_type=BlockType.LAB,
+                                block_type=LAB,
                                 staff_member=ta,
-                                student_count=study_plan.expected_students
-                                // course.lab_groups,  # Use correct study plan
-                                required_room_type=(
-                                    "lab" if course.practical_in_lab else "hall"
-                                ),
+                                student_count=lab_students,
+                                required_room_type=lab_room_type,
                                 preferred_rooms=course.preferred_labs,
                                 group_number=lab_group_count,
                                 total_groups=course.lab_groups,
-                                is_single_group_course=course.lab_groups == 1,
-                                academic_list=study_plan.academic_list.name,  # Use correct study plan
-                                academic_list_object=study_plan.academic_list,
-                                academic_level=study_plan.academic_level,  # Use correct study plan
+                                is_single_group_course=lab_single_group,
+                                academic_list=academic_list_name,
+                                academic_list_object=academic_list,
+                                academic_level=academic_level,
                                 practical_in_lab=course.practical_in_lab,
                             )
 
                             blocks.append(lab_block)
                             lab_blocks_created += 1
 
-                            self.logger.info(f"      CREATED LAB BLOCK: {block_id}")
-                            self.logger.info(
-                                f"        Study Plan: {study_plan.academic_list.name} L{study_plan.academic_level}"
-                            )
-                            self.logger.info(f"        Staff: {ta.name}")
+                            if log_info:
+                                self.logger.info(f"      CREATED LAB BLOCK: {block_id}")
+                                self.logger.info(
+                                    f"        Study Plan: {study_plan.academic_list.name} L{study_plan.academic_level}"
+                                )
+                                self.logger.info(f"        Staff: {ta.name}")
 
                             lab_group_count += 1
 
@@ -433,61 +656,22 @@ class SchedulingEngine:
                         )
 
         # Final summary
-        lecture_blocks = [b for b in blocks if b.block_type == BlockType.LECTURE]
-        lab_blocks = [b for b in blocks if b.block_type == BlockType.LAB]
+        lecture_block_count = sum(1 for b in blocks if b.is_lecture)
 
         self.logger.info(f"\n=== BLOCK GENERATION SUMMARY ===")
         self.logger.info(f"Total Blocks Created: {len(blocks)}")
-        self.logger.info(f"Lecture Blocks: {len(lecture_blocks)}")
-        self.logger.info(f"Lab Blocks: {len(lab_blocks)}")
+        self.logger.info(f"Lecture Blocks: {lecture_block_count}")
+        self.logger.info(f"Lab Blocks: {len(blocks) - lecture_block_count}")
 
         return blocks
 
-    def get_block_score(self, block: Block) -> tuple:
-        # Get possible rooms for this block
-        possible_rooms = self._get_possible_rooms(block)
-
-        # Calculate total available time slots across all possible rooms
-        total_available_slots = 0
-        current_assignments = (
-            self.constraint_manager.get_all_assignments()
-        )  # FIX: Get from constraint manager
-
-        for room in possible_rooms:
-            available_slots = self.resource_manager.get_available_slots(
-                block,
-                room,
-                current_assignments,  # FIX: Use assignments from constraint manager
-            )
-            total_available_slots += len(available_slots)
-
-        # Calculate priority score
-        priority_score = self._calculate_block_priority(block)
-
-        return (
-            # First priority: Single group courses
-            block.is_single_group_course,
-            # Second priority: Fewer room options means more constrained
-            -len(possible_rooms),
-            # Third priority: Fewer time slot options means more constrained
-            -total_available_slots,
-            # Fourth priority: Calculated priority score
-            priority_score,
-        )
-
-        sorted_blocks = sorted(blocks, key=get_block_score, reverse=True)
-
-        self.logger.debug("Block priority order:")
-        for i, block in enumerate(sorted_blocks[:5]):  # Log first 5
-            score = get_block_score(block)
-            self.logger.debug(f"  {i+1}. {block.id} - Score: {score}")
-
-        return sorted_blocks
-
     def _get_possible_rooms(self, block: Block) -> List[Union[Hall, Lab]]:
         """Get list of possible rooms for a block"""
-        rooms = self.resource_manager.get_suitable_rooms(block)
-        self.logger.debug(f"Block {block.id} has {len(rooms)} possible rooms")
+        rooms = self._rooms_cache.get(block.id)
+        if rooms is None:
+            rooms = self.resource_manager.get_suitable_rooms(block)
+            self._rooms_cache[block.id] = rooms
+            self.logger.debug(f"Block {block.id} has {len(rooms)} possible rooms")
         return rooms
 
     def _calculate_block_priority(self, block: Block) -> float:
@@ -690,13 +874,14 @@ class SchedulingEngine:
         if not assignments:
             return 0.0
 
+        # Bound once; this runs for every attempt and every local-search pass
+        evaluate = self.constraint_manager.evaluate_soft_constraints
         total_score = 0.0
         for assignment in assignments.values():
             # Get soft constraint score
-            score = self.constraint_manager.evaluate_soft_constraints(
+            total_score += evaluate(
                 assignment.block, assignment.time_slot, assignment.room
             )
-            total_score += score
 
         return total_score / len(assignments)
 
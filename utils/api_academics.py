@@ -1,9 +1,10 @@
 # utils/api_academics.py
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from models.academic_list import AcademicList, Course
+from models.academic_list import AcademicList, Course, CourseRow
 from models.department import Department
 from utils.api_departments import convert_api_department
 
@@ -42,20 +43,34 @@ def convert_api_course(course_data: Dict[str, Any]) -> Course:
     prerequisite_course = course_data.get("prerequisiteCourse", None)
 
     logging.debug(
-        f"Converting course: {code} - {name_en} ({lecture_hours}+{practical_hours} hrs)"
+        "Converting course: %s - %s (%s+%s hrs)",
+        code,
+        name_en,
+        lecture_hours,
+        practical_hours,
     )
 
-    # Create and return the Course object
-    return Course(
-        id=id,
-        code=code,
-        name_en=name_en,
-        name_ar=name_ar,
-        lecture_hours=lecture_hours,
-        practical_hours=practical_hours,
-        credit_hours=credit_hours,
-        prerequisite_course=prerequisite_course,
+    # Create (or reuse) the Course object; unhashable payloads skip the cache
+    row = (
+        id,
+        code,
+        name_en,
+        name_ar,
+        lecture_hours,
+        practical_hours,
+        credit_hours,
+        prerequisite_course,
     )
+    if prerequisite_course is not None and not isinstance(prerequisite_course, str):
+        return Course._from_row(row)
+    return _cached_course(row)
+
+
+@lru_cache(maxsize=1024)
+def _cached_course(row: CourseRow) -> Course:
+    """Build one shared Course per distinct payload, so a course listed in
+    several academic lists is validated and stored only once"""
+    return Course._from_row(row)
 
 
 def convert_api_academic_list_summary(
@@ -83,7 +98,7 @@ def convert_api_academic_list_summary(
     department_data = academic_list_data.get("department", {})
     department = convert_api_department(department_data)
 
-    logging.debug(f"Converting academic list summary: {name} (ID: {academic_id})")
+    logging.debug("Converting academic list summary: %s (ID: %s)", name, academic_id)
 
     return {
         "id": academic_id,
@@ -127,7 +142,7 @@ def convert_api_academic_list_detail(
         except Exception as e:
             logging.error(f"Error converting course in academic list {name}: {str(e)}")
 
-    logging.debug(f"Converting academic list: {name} with {len(courses)} courses")
+    logging.debug("Converting academic list: %s with %d courses", name, len(courses))
 
     return AcademicList(
         id=academic_id, name=name, department=department, courses=courses
@@ -1,12 +1,23 @@
 # utils/api_departments.py
 
 
-import logging
-from typing import List
+from functools import lru_cache
+from typing import Union
 
 from models.department import Department
 
 
-def convert_api_department(department_data: dict) -> Department:
+def convert_api_department(department_data: Union[dict, Department]) -> Department:
     """Convert API department data to Department object."""
-    return Department(id=department_data["id"], name=department_data["name"])
+    # Payloads passed through twice may already hold the converted object
+    if isinstance(department_data, Department):
+        return department_data
+    return _cached_department(department_data["id"], department_data["name"])
+
+
+@lru_cache(maxsize=None)
+def _cached_department(department_id: int, name: str) -> Department:
+    """Build one shared Department per distinct (id, name) payload"""
+    # Unbounded: a university has few departments, and without a size limit
+    # lru_cache is a plain dict lookup with no recency bookkeeping
+    return Department(id=department_id, name=name)
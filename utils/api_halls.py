@@ -2,7 +2,7 @@
 
 
 from models.halls import Hall
-from utils.time_utils import convert_api_time_preference
+from utils.time_utils import convert_api_time_preference, shared_time_preferences
 
 
 def convert_api_hall(hall_data: dict) -> Hall:
@@ -11,8 +11,10 @@ def convert_api_hall(hall_data: dict) -> Hall:
     name = hall_data["name"]
     capacity = hall_data["capacity"]
 
-    availability = []
-    for time_pref_data in hall_data["availability"]:
-        availability.append(convert_api_time_preference(time_pref_data))
+    # Rooms mostly share one availability grid; identical sets share a tuple
+    availability = shared_time_preferences(
+        convert_api_time_preference(time_pref_data)
+        for time_pref_data in hall_data["availability"]
+    )
 
     return Hall(hall_id, name, capacity, availability)
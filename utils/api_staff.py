@@ -2,10 +2,9 @@
 
 
 import logging
-from datetime import time
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Union
 
-from models.department import Department
 from models.staff_members import (
     AcademicDegree,
     Lecturer,
@@ -13,24 +12,41 @@ from models.staff_members import (
     TeachingAssistant,
 )
 from utils.api_departments import convert_api_department
-from utils.time_utils import convert_api_time_preference
+from utils.time_utils import convert_api_time_preference, shared_time_preferences
 
 
-def convert_api_academic_degree(degree_data: Dict[str, Any]) -> AcademicDegree:
+def convert_api_academic_degree(
+    degree_data: Union[Dict[str, Any], AcademicDegree],
+) -> AcademicDegree:
     """Convert API academic degree data to AcademicDegree object."""
-    return AcademicDegree(
-        id=degree_data["id"], name=degree_data["name"], prefix=degree_data["prefix"]
+    if isinstance(degree_data, AcademicDegree):
+        return degree_data
+    return _cached_academic_degree(
+        degree_data["id"], degree_data["name"], degree_data["prefix"]
     )
 
 
-def is_lecturer_degree(degree: AcademicDegree) -> bool:
-    """Check if the academic degree corresponds to a lecturer role"""
-    lecturer_degree_ids = {
-        1,
-        2,
-        3,
-    }
-    return degree in lecturer_degree_ids
+@lru_cache(maxsize=None)
+def _cached_academic_degree(degree_id: int, name: str, prefix: str) -> AcademicDegree:
+    """Build one shared AcademicDegree per distinct (id, name, prefix) payload"""
+    # Every staff record carries one of a handful of degrees
+    return AcademicDegree(id=degree_id, name=name, prefix=prefix)
+
+
+# Bound once at import; the check runs for every staff record
+_LECTURER_DEGREE_IDS = Lecturer.ALLOWED_DEGREES
+
+# is_lecturer_degree result -> staff class to construct
+_STAFF_CLASS_BY_ROLE = {True: Lecturer, False: TeachingAssistant}
+_ROLE_NAMES = {
+    Lecturer: "a lecturer role",
+    TeachingAssistant: "a teaching assistant role",
+}
+
+
+def is_lecturer_degree(degree: int) -> bool:
+    """Check if the academic degree id corresponds to a lecturer role"""
+    return degree in _LECTURER_DEGREE_IDS
 
 
 def convert_api_staff_member(staff_data: Dict[str, Any]) -> StaffMember:
@@ -39,53 +55,81 @@ def convert_api_staff_member(staff_data: Dict[str, Any]) -> StaffMember:
 
     Automatically determines the correct type based on the academic degree.
     """
+    return _convert_api_staff_member(staff_data)
+
+
+def _convert_api_staff_member(
+    staff_data: Dict[str, Any], expected_class: Optional[type] = None
+) -> StaffMember:
+    # expected_class is checked right after the degree is known, before the
+    # department, preferences or staff object are built
     if not staff_data or not isinstance(staff_data, dict):
         raise ValueError(f"Invalid staff data: {staff_data}")
 
-    staff_id = staff_data.get("id")
-    name = staff_data.get("nameEn") or staff_data.get("name")
+    # One bound lookup for the record's many field reads
+    get = staff_data.get
+
+    # Convert academic degree and pick the staff type it implies
+    degree_data = get("academic_degree", {})
+    academic_degree = convert_api_academic_degree(degree_data)
+    staff_class = _STAFF_CLASS_BY_ROLE[is_lecturer_degree(academic_degree.id)]
+    if expected_class is not None and staff_class is not expected_class:
+        raise ValueError(
+            f"Staff member {get('name')} has degree {degree_data.get('name')} "
+            f"which is not {_ROLE_NAMES[expected_class]}"
+        )
+
+    staff_id = get("id")
+    name = get("nameEn") or get("name")
 
     # Convert department
-    department_data = staff_data.get("department", {})
+    department_data = get("department", {})
     department = convert_api_department(department_data)
 
-    # Convert academic degree
-    degree_data = staff_data.get("academic_degree", {})
-    academic_degree = convert_api_academic_degree(degree_data)
-
-    # Convert timing preferences
-    timing_preferences = []
-    for pref_data in staff_data.get("timingPreference", []):
-        timing_preferences.append(convert_api_time_preference(pref_data))
+    # Convert timing preferences; identical sets share one tuple
+    timing_preferences = shared_time_preferences(
+        convert_api_time_preference(pref_data)
+        for pref_data in get("timingPreference", ())
+    )
 
     # Convert isPermanent to boolean (handles 0/1 values)
-    is_permanent = bool(staff_data.get("isPermanent", 1))
+    is_permanent = bool(get("isPermanent", 1))
+
+    logging.debug(
+        "Creating %s: %s (ID: %s), Degree: %s",
+        staff_class.__name__,
+        name,
+        staff_id,
+        academic_degree.name,
+    )
+    return staff_class(
+        id=staff_id,
+        name=name,
+        department=department,
+        timing_preferences=timing_preferences,
+        academic_degree=academic_degree,
+        is_permanent=is_permanent,
+    )
 
-    # Determine the correct staff type based on academic degree
-    if is_lecturer_degree(academic_degree.id):
-        logging.debug(
-            f"Creating Lecturer: {name} (ID: {staff_id}), Degree: {academic_degree.name}"
-        )
-        return Lecturer(
-            id=staff_id,
-            name=name,
-            department=department,
-            timing_preferences=timing_preferences,
-            academic_degree=academic_degree,
-            is_permanent=is_permanent,
-        )
-    else:
-        logging.debug(
-            f"Creating TeachingAssistant: {name} (ID: {staff_id}), Degree: {academic_degree.name}"
-        )
-        return TeachingAssistant(
-            id=staff_id,
-            name=name,
-            department=department,
-            timing_preferences=timing_preferences,
-            academic_degree=academic_degree,
-            is_permanent=is_permanent,
-        )
+
+def convert_api_staff_members(
+    staff_rows: Iterable[Dict[str, Any]],
+) -> List[StaffMember]:
+    """
+    Convert a batch of API staff records, skipping records that fail.
+
+    Departments, degrees and time preferences are memoized by payload, so a
+    batch resolves each distinct one once however many rows repeat it.
+    """
+    staff_members = []
+    for staff_data in staff_rows:
+        try:
+            staff_members.append(convert_api_staff_member(staff_data))
+        except Exception as e:
+            logging.error(
+                f"Error converting staff member {staff_data.get('name', 'unknown')}: {str(e)}"
+            )
+    return staff_members
 
 
 def convert_api_lecturer(staff_data: Dict[str, Any]) -> Lecturer:
@@ -95,12 +139,7 @@ def convert_api_lecturer(staff_data: Dict[str, Any]) -> Lecturer:
     Use this when you're certain the data represents a lecturer.
     Will raise an error if the academic degree doesn't match a lecturer role.
     """
-    staff_member = convert_api_staff_member(staff_data)
-    if not isinstance(staff_member, Lecturer):
-        raise ValueError(
-            f"Staff member {staff_data.get('name')} has degree {staff_data.get('academic_degree', {}).get('name')} which is not a lecturer role"
-        )
-    return staff_member
+    return _convert_api_staff_member(staff_data, Lecturer)
 
 
 def convert_api_teaching_assistant(staff_data: Dict[str, Any]) -> TeachingAssistant:
@@ -110,9 +149,4 @@ def convert_api_teaching_assistant(staff_data: Dict[str, Any]) -> TeachingAssist
     Use this when you're certain the data represents a teaching assistant.
     Will raise an error if the academic degree doesn't match a teaching assistant role.
     """
-    staff_member = convert_api_staff_member(staff_data)
-    if not isinstance(staff_member, TeachingAssistant):
-        raise ValueError(
-            f"Staff member {staff_data.get('name')} has degree {staff_data.get('academic_degree', {}).get('name')} which is not a teaching assistant role"
-        )
-    return staff_member
+    return _convert_api_staff_member(staff_data, TeachingAssistant)
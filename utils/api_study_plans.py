@@ -1,6 +1,7 @@
 # utils/api_study_plans.py - Enhanced with comprehensive logging
 
 import logging
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 from backend.get_academics import get_academic_list_by_id
@@ -242,16 +243,16 @@ def convert_api_course_assignment(
         # Fetch actual Lab objects
         logger.info("Resolving preferred labs...")
         all_labs = get_labs()
-        logger.info(f"Available labs: {[lab.id for lab in all_labs]}")
+        labs_by_id = {lab.id: lab for lab in all_labs}
+        logger.info(f"Available labs: {list(labs_by_id)}")
 
         for lab_data in preferred_labs_data:
             lab_id = lab_data.get("id")
             logger.info(f"Looking for lab ID: {lab_id}")
-            for lab in all_labs:
-                if lab.id == lab_id:
-                    preferred_labs.append(lab)
-                    logger.info(f"Found preferred lab: {lab.name}")
-                    break
+            lab = labs_by_id.get(lab_id)
+            if lab is not None:
+                preferred_labs.append(lab)
+                logger.info(f"Found preferred lab: {lab.name}")
             else:
                 logger.warning(f"Preferred lab with ID {lab_id} not found")
 
@@ -435,8 +436,8 @@ def convert_api_study_plan_detail(
     logger.info(f"Successfully processed {len(course_assignments)} course assignments")
 
     # Log summary
-    total_lecture_groups = sum(ca.lecture_groups for ca in course_assignments)
-    total_lab_groups = sum(ca.lab_groups or 0 for ca in course_assignments)
+    total_lecture_groups = sum(map(attrgetter("lecture_groups"), course_assignments))
+    total_lab_groups = sum(map(attrgetter("lab_groups"), course_assignments))
 
     logger.info(f"\n=== STUDY PLAN CONVERSION SUMMARY ===")
     logger.info(f"Study plan: {name}")
@@ -16,5 +16,5 @@ def get_room_key(room: Union[Hall, Lab]) -> Tuple[str, int]:
     Returns:
         Tuple of (room_type, room_id) where room_type is 'hall' or 'lab'
     """
-    room_type = "hall" if isinstance(room, Hall) else "lab"
+    room_type = "lab" if room.is_lab else "hall"
     return (room_type, room.id)
@@ -2,19 +2,28 @@
 
 
 from datetime import time
+from functools import lru_cache
+from typing import Iterable, Tuple
 
 from models.time_preferences import Day, TimePreference
 
+# Read-only view of the enum's own name -> member dict; nothing is copied
+_DAYS_BY_NAME = Day.__members__
 
+
+# Payloads repeat the same few day names and clock times thousands of times;
+# both parsers are pure, so each distinct string is converted once
+@lru_cache(maxsize=None)
 def convert_api_day_to_enum(day_str: str) -> Day:
     """Convert day string from API to Day enum"""
     day_str = day_str.upper()
-    for day in Day:
-        if day.name == day_str:
-            return day
-    raise ValueError(f"Unknown day: {day_str}")
+    day = _DAYS_BY_NAME.get(day_str)
+    if day is None:
+        raise ValueError(f"Unknown day: {day_str}")
+    return day
 
 
+@lru_cache(maxsize=None)
 def convert_api_time_to_time_object(time_str: str) -> time:
     """Convert time string from API (HH:MM format) to time object"""
     hours, minutes = map(int, time_str.split(":"))
@@ -27,4 +36,26 @@ def convert_api_time_preference(time_pref_data: dict) -> TimePreference:
     start_time = convert_api_time_to_time_object(time_pref_data["startTime"])
     end_time = convert_api_time_to_time_object(time_pref_data["endTime"])
 
+    return _shared_time_preference(day, start_time, end_time)
+
+
+@lru_cache(maxsize=None)
+def _shared_time_preference(
+    day: Day, start_time: time, end_time: time
+) -> TimePreference:
+    # Staff, halls and labs mostly repeat the same few weekly slots
     return TimePreference(day, start_time, end_time)
+
+
+@lru_cache(maxsize=None)
+def _shared_preference_tuple(
+    preferences: Tuple[TimePreference, ...],
+) -> Tuple[TimePreference, ...]:
+    return preferences
+
+
+def shared_time_preferences(
+    preferences: Iterable[TimePreference],
+) -> Tuple[TimePreference, ...]:
+    """Return preferences as a tuple shared by every caller with the same slots"""
+    return _shared_preference_tuple(tuple(preferences))